@@ -1,9 +1,6 @@
-import tkinter as tk
-from tkinter import ttk
-from screeninfo import get_monitors
-import threading
-import pystray
-from PIL import Image, ImageDraw, ImageTk
+import time
+_PROCESS_T0 = time.perf_counter()
+
 import sys
 import os
 import winreg
@@ -12,8 +9,38 @@ import subprocess
 import webbrowser
 import json
 import urllib.request
-import time
+import urllib.error
 import socket
+import threading
+import heapq
+import itertools
+import array
+import traceback
+import struct
+import queue
+import hmac
+import mmap
+import io
+from screeninfo import get_monitors
+
+# Headless daemon mode never loads the GUI toolkit, the tray or PIL
+DAEMON_MODE = __name__ == "__main__" and "--daemon" in [a.lower() for a in sys.argv[1:]]
+
+if not DAEMON_MODE:
+    import tkinter as tk
+    from tkinter import ttk
+else:
+    tk = ttk = None
+# Loaded by load_gui_modules() once the saved ramps are on screen
+pystray = Image = ImageDraw = ImageTk = None
+
+def load_gui_modules():
+    global pystray, Image, ImageDraw, ImageTk
+    with PROFILER.phase("gui_imports"):
+        import pystray
+        from PIL import Image, ImageDraw, ImageTk
+
+_IMPORTS_DONE = time.perf_counter()
 
 try:
     import ctypes
@@ -63,6 +90,31 @@ class MONITORINFO(Structure):
         ("dwFlags", ctypes.c_ulong)
     ]
 
+class MONITORINFOEXW(Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_ulong),
+        ("rcMonitor", RECT),
+        ("rcWork", RECT),
+        ("dwFlags", ctypes.c_ulong),
+        ("szDevice", ctypes.c_wchar * 32)
+    ]
+
+class DISPLAY_DEVICEW(Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("DeviceName", ctypes.c_wchar * 32),
+        ("DeviceString", ctypes.c_wchar * 128),
+        ("StateFlags", ctypes.c_ulong),
+        ("DeviceID", ctypes.c_wchar * 128),
+        ("DeviceKey", ctypes.c_wchar * 128)
+    ]
+
+class PHYSICAL_MONITOR(Structure):
+    _fields_ = [
+        ("hPhysicalMonitor", ctypes.c_void_p),
+        ("szPhysicalMonitorDescription", ctypes.c_wchar * 128)
+    ]
+
 def get_real_monitor_names():
     names = []
     try:
@@ -91,11 +143,536 @@ def get_real_monitor_names():
         print(f"Error fetching WMI names: {e}")
     return names
 
+# --- Config ---
+def get_config_dir():
+    config_dir = os.path.join(os.getenv('APPDATA'), 'NoxDimmer')
+    if not os.path.exists(config_dir):
+        os.makedirs(config_dir)
+    return config_dir
+
+def get_config_path():
+    return os.path.join(get_config_dir(), 'config.json')
+
+def read_config_data():
+    try:
+        with open(get_config_path(), 'r') as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except:
+        return {}
+
+def load_config():
+    return read_config_data().get("dim_level", 30)
+
+def config_number(config, key, default, lo, hi):
+    # Hand-edited numbers: anything that isn't a number in [lo, hi] falls back to the default
+    value = config.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not lo <= value <= hi:
+        return default
+    return value
+
+def save_config(dim_level):
+    # Other keys (e.g. update_url) are hand-edited settings and must survive a save
+    try:
+        data = read_config_data()
+        data["dim_level"] = dim_level
+        with open(get_config_path(), 'w') as f:
+            json.dump(data, f)
+    except Exception as e:
+        TRACE.error(SITE_SAVE_CONFIG)
+
+# --- Update Check ---
+CURRENT_VERSION = "v1.4"
+DEFAULT_UPDATE_URL = "https://api.github.com/repos/YashvardhanG/Nox-Dimmer/releases/latest"
+RELEASES_PAGE_URL = "https://github.com/YashvardhanG/Nox-Dimmer/releases/latest"
+UPDATE_CHECK_TTL_S = 24 * 60 * 60
+
+def get_update_url():
+    # NOX_UPDATE_URL or "update_url" in config.json can point at a mirror or a local stand-in
+    return os.getenv('NOX_UPDATE_URL') or read_config_data().get("update_url") or DEFAULT_UPDATE_URL
+
+def get_update_cache_path():
+    return os.path.join(get_config_dir(), 'update_cache.json')
+
+def load_update_cache(url):
+    try:
+        with open(get_update_cache_path(), 'r') as f:
+            cache = json.load(f)
+        if cache.get("url") == url and cache.get("tag_name"):
+            return cache
+    except:
+        pass
+    return {}
+
+def get_cached_release(url):
+    cache = load_update_cache(url)
+    if cache and 0 <= time.time() - cache.get("checked_at", 0) < UPDATE_CHECK_TTL_S:
+        return cache["tag_name"], cache.get("html_url", RELEASES_PAGE_URL)
+    return None
+
+def fetch_latest_release(url):
+    cache = load_update_cache(url)
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if cache.get("etag"):
+        headers['If-None-Match'] = cache["etag"]
+
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            data = json.loads(response.read().decode('utf-8'))
+            cache = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "tag_name": data.get("tag_name", ""),
+                "html_url": data.get("html_url", RELEASES_PAGE_URL)
+            }
+    except urllib.error.HTTPError as e:
+        # 304 Not Modified: the cached release is still current
+        if e.code != 304 or not cache:
+            raise
+
+    cache["checked_at"] = time.time()
+    try:
+        with open(get_update_cache_path(), 'w') as f:
+            json.dump(cache, f)
+    except Exception as e:
+        pass
+    return cache["tag_name"], cache.get("html_url", RELEASES_PAGE_URL)
+
+# --- Event Trace ---
+TRACE_CAPACITY = 4096 # power of two
+
+EV_APPLY = 1
+EV_RESET = 2
+EV_HOTKEY = 3
+EV_IPC = 4
+EV_ERROR = 5
+EV_DUMP = 6
+EV_PROBE = 7
+EV_REJECTED = 8
+TRACE_EVENT_NAMES = {EV_APPLY: "apply", EV_RESET: "reset_detected", EV_HOTKEY: "hotkey",
+                     EV_IPC: "ipc", EV_ERROR: "error", EV_DUMP: "dump",
+                     EV_PROBE: "ramp_probe", EV_REJECTED: "ramp_rejected"}
+
+SITE_HOTKEY = 1
+SITE_WAKE = 2
+SITE_GAMMA_RESET = 3
+SITE_SAVE_CONFIG = 4
+SITE_UNCAUGHT = 5
+SITE_WORKER = 6
+SITE_DISPATCH = 7
+SITE_STATE = 8
+TRACE_SITE_NAMES = {SITE_HOTKEY: "hotkey_listener", SITE_WAKE: "listen_for_wake",
+                    SITE_GAMMA_RESET: "is_gamma_reset", SITE_SAVE_CONFIG: "save_config",
+                    SITE_UNCAUGHT: "uncaught", SITE_WORKER: "background_job",
+                    SITE_DISPATCH: "ui_dispatch", SITE_STATE: "state_subscriber"}
+
+class EventTrace:
+    # Preallocated ring of (timestamp, kind, a, b). Writers claim a slot with one
+    # next() on a shared counter, which is atomic under the GIL, so no locks are taken.
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._seq = itertools.count()
+        self._ts = array.array('q', bytes(8 * capacity))
+        self._kind = array.array('b', bytes(capacity))
+        self._a = array.array('i', bytes(4 * capacity))
+        self._b = array.array('i', bytes(4 * capacity))
+
+    def record(self, kind, a=0, b=0):
+        i = next(self._seq) & self._mask
+        self._ts[i] = time.perf_counter_ns()
+        self._kind[i] = kind
+        self._a[i] = a
+        self._b[i] = b
+
+    def error(self, site):
+        # Line of the innermost frame, where the exception was actually raised
+        tb = sys.exc_info()[2]
+        while tb and tb.tb_next:
+            tb = tb.tb_next
+        self.record(EV_ERROR, site, tb.tb_lineno if tb else 0)
+
+    def _describe(self, kind, a, b):
+        if kind == EV_APPLY:
+            return {'monitor': a, 'dim': b}
+        if kind == EV_RESET:
+            return {'monitor': a, 'expected_dim': b}
+        if kind == EV_PROBE:
+            if b < 0:
+                return {'monitor': a, 'transient_failure': True}
+            return {'monitor': a, 'max_dim': b}
+        if kind == EV_REJECTED:
+            return {'monitor': a, 'dim': b}
+        if kind == EV_HOTKEY:
+            return {'vk': a, 'state': ("up", "down", "repeat")[b] if 0 <= b <= 2 else b}
+        if kind == EV_IPC:
+            return {'command': IPC_COMMANDS[a].decode() if 0 <= a < len(IPC_COMMANDS) else a}
+        if kind == EV_ERROR:
+            return {'site': TRACE_SITE_NAMES.get(a, a), 'line': b}
+        return {'a': a, 'b': b}
+
+    def snapshot(self):
+        # The dump claims a slot of its own, so everything before it is complete
+        # apart from writers racing on the very oldest slots.
+        n = next(self._seq)
+        i = n & self._mask
+        self._ts[i] = time.perf_counter_ns()
+        self._kind[i] = EV_DUMP
+        self._a[i] = self._b[i] = 0
+
+        events = []
+        for seq in range(max(0, n - self._mask), n + 1):
+            i = seq & self._mask
+            kind = self._kind[i]
+            event = {'seq': seq, 't_ms': round(self._ts[i] / 1e6 - _PROCESS_T0 * 1000, 3),
+                     'event': TRACE_EVENT_NAMES.get(kind, kind)}
+            event.update(self._describe(kind, self._a[i], self._b[i]))
+            events.append(event)
+        return events
+
+    def dump(self, name=None):
+        path = os.path.join(get_config_dir(), name or time.strftime("trace-%Y%m%d-%H%M%S.jsonl"))
+        try:
+            with open(path, 'w') as f:
+                for event in self.snapshot():
+                    f.write(json.dumps(event) + "\n")
+            return path
+        except Exception as e:
+            print(f"Trace dump error: {e}")
+            return None
+
+TRACE = EventTrace()
+
+def _on_crash(exc_type, exc, tb):
+    TRACE.record(EV_ERROR, SITE_UNCAUGHT, tb.tb_lineno if tb else 0)
+    TRACE.dump("trace-crash.jsonl")
+
+def install_crash_dump(root=None):
+    prev_hook = sys.excepthook
+    prev_thread_hook = threading.excepthook
+    on_crash = _on_crash
+
+    def excepthook(exc_type, exc, tb):
+        on_crash(exc_type, exc, tb)
+        prev_hook(exc_type, exc, tb)
+
+    def thread_excepthook(hook_args):
+        on_crash(hook_args.exc_type, hook_args.exc_value, hook_args.exc_traceback)
+        prev_thread_hook(hook_args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+    if root is not None:
+        install_tk_crash_dump(root)
+
+def install_tk_crash_dump(root):
+    if tk is None:
+        return
+    def report_callback_exception(exc_type, exc, tb):
+        _on_crash(exc_type, exc, tb)
+        traceback.print_exception(exc_type, exc, tb)
+    root.report_callback_exception = report_callback_exception
+
+# --- Profiling (--profile) ---
+PROFILE_SAMPLE_EVERY = 16
+
+def _ms_since_start(t):
+    return round((t - _PROCESS_T0) * 1000, 3)
+
+class _NullPhase:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler.phases.append({
+            'name': self.name,
+            'thread': threading.current_thread().name,
+            'start_ms': _ms_since_start(self.start),
+            'end_ms': _ms_since_start(end),
+            'duration_ms': round((end - self.start) * 1000, 3),
+            'failed': exc[0] is not None
+        })
+        return False
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.hot = False
+        self.phases = []
+        self.marks = []
+        self.handlers = {}
+        self.report_path = None
+
+    def enable(self, hot=False):
+        self.enabled = True
+        self.hot = hot
+        self.report_path = os.path.join(get_config_dir(), time.strftime("profile-%Y%m%d-%H%M%S.json"))
+        self.phases.append({
+            'name': 'imports', 'thread': 'MainThread', 'start_ms': 0.0,
+            'end_ms': _ms_since_start(_IMPORTS_DONE),
+            'duration_ms': _ms_since_start(_IMPORTS_DONE), 'failed': False
+        })
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append({'name': name, 'at_ms': _ms_since_start(time.perf_counter())})
+
+    def wrap(self, func, name):
+        # Profiles every PROFILE_SAMPLE_EVERY-th call so drags and enforcement stay cheap
+        if not self.hot:
+            return func
+        # Imported here: pstats alone costs tens of ms, and only --profile=hot needs it
+        import cProfile
+        entry = {'profile': cProfile.Profile(), 'calls': 0, 'sampled': 0, 'active': False}
+        self.handlers[name] = entry
+
+        def wrapper(*args, **kwargs):
+            entry['calls'] += 1
+            if entry['calls'] % PROFILE_SAMPLE_EVERY != 1 or entry['active'] or threading.current_thread() is not threading.main_thread():
+                return func(*args, **kwargs)
+            entry['active'] = True
+            entry['sampled'] += 1
+            entry['profile'].enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry['profile'].disable()
+                entry['active'] = False
+        return wrapper
+
+    def _handler_report(self, entry):
+        report = {'calls': entry['calls'], 'sampled': entry['sampled'], 'top': []}
+        if not entry['sampled']:
+            return report
+        import pstats
+        stats = pstats.Stats(entry['profile']).stats
+        rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:15]
+        for (filename, line, func), (cc, nc, tt, ct, callers) in rows:
+            report['top'].append({
+                'function': f"{os.path.basename(filename)}:{line}({func})",
+                'calls': nc, 'self_ms': round(tt * 1000, 3), 'cumulative_ms': round(ct * 1000, 3)
+            })
+        return report
+
+    def write_report(self, reason, **extra):
+        if not self.enabled:
+            return
+        report = {
+            'reason': reason,
+            'argv': sys.argv[1:],
+            'written_at_ms': _ms_since_start(time.perf_counter()),
+            'phases': sorted(self.phases, key=lambda p: p['start_ms']),
+            'marks': self.marks,
+            'handlers': {name: self._handler_report(e) for name, e in self.handlers.items()},
+        }
+        report.update(extra)
+        try:
+            with open(self.report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            print(f"Profile report error: {e}")
+
+PROFILER = StartupProfiler()
+
+# --- Background Work & UI Dispatch ---
+WORKER_THREADS = 2
+UI_QUEUE_SIZE = 256
+UI_DRAIN_BATCH = 64
+UI_DRAIN_BUSY_MS = 15
+UI_DRAIN_IDLE_MS = 30
+
+class BackgroundJob:
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class BackgroundExecutor:
+    # A fixed set of threads: WORKER_THREADS for short jobs (name lookup, update
+    # check) plus one named thread per long-running service (tray, hotkeys, IPC).
+    def __init__(self, workers=WORKER_THREADS):
+        self.jobs = queue.Queue()
+        self.closed = False
+        self.workers = []
+        self.services = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"nox-worker-{i}", daemon=True)
+            t.start()
+            self.workers.append(t)
+
+    def submit(self, func, *args):
+        job = BackgroundJob(func, args)
+        if self.closed:
+            job.cancel()
+        else:
+            self.jobs.put(job)
+        return job
+
+    def start_service(self, name, func, *args):
+        t = threading.Thread(target=func, args=args, name=f"nox-{name}", daemon=True)
+        t.start()
+        self.services.append(t)
+        return t
+
+    def thread_count(self):
+        return len(self.workers) + len(self.services)
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            if job.cancelled:
+                continue
+            try:
+                job.func(*job.args)
+            except Exception as e:
+                TRACE.error(SITE_WORKER)
+
+    def shutdown(self):
+        self.closed = True
+        try:
+            while True:
+                job = self.jobs.get_nowait()
+                if job: job.cancel()
+        except queue.Empty:
+            pass
+        for _ in self.workers:
+            self.jobs.put(None)
+
+class UiDispatcher:
+    # The only way other threads touch the UI: post() into a bounded FIFO that the
+    # event loop drains in batches, so bursts keep their order and never pile up.
+    def __init__(self, root, maxsize=UI_QUEUE_SIZE):
+        self.root = root
+        self.queue = queue.Queue(maxsize)
+        self.closed = False
+        self.posted = 0
+        self.dropped = 0
+        self.max_wait_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.drained = 0
+        self.root.after(UI_DRAIN_IDLE_MS, self._drain)
+
+    def post(self, func, *args):
+        if self.closed:
+            return False
+        try:
+            self.queue.put((time.perf_counter(), func, args), timeout=0.25)
+            self.posted += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            TRACE.record(EV_ERROR, SITE_DISPATCH, 0)
+            return False
+
+    def _drain(self):
+        handled = 0
+        while handled < UI_DRAIN_BATCH:
+            try:
+                posted_at, func, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            wait_ms = (time.perf_counter() - posted_at) * 1000
+            self.total_wait_ms += wait_ms
+            if wait_ms > self.max_wait_ms: self.max_wait_ms = wait_ms
+            try:
+                func(*args)
+            except Exception as e:
+                TRACE.error(SITE_DISPATCH)
+                traceback.print_exc()
+        self.drained += handled
+        if not self.closed:
+            self.root.after(UI_DRAIN_BUSY_MS if handled else UI_DRAIN_IDLE_MS, self._drain)
+
+    def close(self):
+        self.closed = True
+
+    def stats(self):
+        return {
+            'posted': self.posted, 'drained': self.drained, 'dropped': self.dropped,
+            'avg_wait_ms': round(self.total_wait_ms / self.drained, 3) if self.drained else 0.0,
+            'max_wait_ms': round(self.max_wait_ms, 3)
+        }
+
 # --- Gamma Controller (Normal Mode) ---
+RAMP_PROBE_ANCHOR = 10       # dim % every driver accepts; the probe starts here when nothing is known yet
+RAMP_REJECTS_BEFORE_PROBE = 3 # consecutive rejected applies before the cached limit is questioned
+RAMP_REPROBE_INTERVAL_S = 60  # at most one re-probe per monitor per interval
+
+_RAMP_CACHE = {}
+
+def build_ramp(dim_percent):
+    # Ramps are immutable once built; there are only 101 of them
+    ramp = _RAMP_CACHE.get(dim_percent)
+    if ramp is None:
+        multiplier = (100 - dim_percent) / 100.0
+        ramp = RAMP()
+        for i in range(256):
+            val = int(i * 256 * multiplier)
+            if val > 65535: val = 65535
+            ramp.Red[i] = val
+            ramp.Green[i] = val
+            ramp.Blue[i] = val
+        _RAMP_CACHE[dim_percent] = ramp
+    return ramp
+
+def get_ramp_caps_path():
+    return os.path.join(get_config_dir(), 'ramp_caps.json')
+
+def load_ramp_caps():
+    try:
+        with open(get_ramp_caps_path(), 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+def save_ramp_caps(caps):
+    try:
+        with open(get_ramp_caps_path(), 'w') as f:
+            json.dump(caps, f, indent=2)
+    except Exception as e:
+        pass
+
+def get_monitor_identity(device_name):
+    # Adapter device name plus the monitor's PnP id, so a different panel on the same output is re-probed
+    try:
+        dd = DISPLAY_DEVICEW()
+        dd.cb = ctypes.sizeof(DISPLAY_DEVICEW)
+        if windll.user32.EnumDisplayDevicesW(device_name, 0, byref(dd), 0):
+            return f"{device_name}|{dd.DeviceID}"
+    except Exception as e:
+        pass
+    return device_name
+
 class GammaController:
     def __init__(self):
         self.monitor_dcs = [] 
-        self.init_monitors()
+        with PROFILER.phase("gamma.init_monitors"):
+            self.init_monitors()
         atexit.register(self.restore_all)
 
     def init_monitors(self):
@@ -123,31 +700,98 @@ class GammaController:
                         'hdc': hdc,
                         'orig': original,
                         'name': m.name,
-                        'friendly_name': friendly_name
+                        'friendly_name': friendly_name,
+                        'identity': get_monitor_identity(m.name),
+                        'max_dim': 100,
+                        'rejects': 0,
+                        'probed_at': None
                     })
 
+        self.load_ramp_limits()
+
+    def load_ramp_limits(self):
+        caps = load_ramp_caps()
+        changed = False
+        for i, m in enumerate(self.monitor_dcs):
+            cached = caps.get(m['identity'])
+            if isinstance(cached, int) and 0 <= cached <= 100:
+                m['max_dim'] = cached
+                continue
+            with PROFILER.phase(f"gamma.probe[{i}]"):
+                limit = self.probe_ramp_limit(i)
+            if limit is not None:
+                caps[m['identity']] = limit
+                changed = True
+        if changed:
+            save_ramp_caps(caps)
+
+    def probe_ramp_limit(self, monitor_index, known_good=None):
+        # Windows rejects ramps too far from identity; binary-search the deepest accepted dim.
+        # Returns None when the failure looks transient (locked desktop, display off, mode switch).
+        m = self.monitor_dcs[monitor_index]
+        m['probed_at'] = time.monotonic()
+        anchor = known_good or RAMP_PROBE_ANCHOR
+        if windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(build_ramp(anchor))):
+            lo, hi = anchor, 100
+        elif windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(build_ramp(0))):
+            # Identity works but a level that used to work doesn't: the limit really dropped
+            lo, hi = 0, anchor - 1
+        else:
+            TRACE.record(EV_PROBE, monitor_index, -1)
+            return None
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(build_ramp(mid))):
+                lo = mid
+            else:
+                hi = mid - 1
+        windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(m['orig']))
+        m['max_dim'] = lo
+        TRACE.record(EV_PROBE, monitor_index, lo)
+        return lo
+
+    def get_max_dim(self, monitor_index):
+        if 0 <= monitor_index < len(self.monitor_dcs):
+            return self.monitor_dcs[monitor_index]['max_dim']
+        return 100
+
+    def _apply(self, monitor_index, dim_percent):
+        m = self.monitor_dcs[monitor_index]
+        dim = min(dim_percent, m['max_dim'])
+        if windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(build_ramp(dim))):
+            m['rejects'] = 0
+            return
+        TRACE.record(EV_REJECTED, monitor_index, dim)
+        m['rejects'] += 1
+        # One rejection is usually transient; only keep failing applies question the cached limit
+        if m['rejects'] < RAMP_REJECTS_BEFORE_PROBE or dim == 0:
+            return
+        if m['probed_at'] is not None and time.monotonic() - m['probed_at'] < RAMP_REPROBE_INTERVAL_S:
+            return
+
+        old_limit = m['max_dim']
+        limit = self.probe_ramp_limit(monitor_index, known_good=old_limit)
+        if limit is None:
+            return
+        m['rejects'] = 0
+        if limit != old_limit:
+            caps = load_ramp_caps()
+            caps[m['identity']] = limit
+            save_ramp_caps(caps)
+        windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(build_ramp(min(dim_percent, limit))))
+
     def set_dim_level(self, monitor_index, dim_percent):
+        dim_percent = int(dim_percent)
         if dim_percent < 0: dim_percent = 0
         if dim_percent > 100: dim_percent = 100 
-        
-        brightness = 100 - dim_percent
-        multiplier = brightness / 100.0
-
-        new_ramp = RAMP()
-        for i in range(256):
-            val = int(i * 256 * multiplier)
-            if val > 65535: val = 65535
-            new_ramp.Red[i] = val
-            new_ramp.Green[i] = val
-            new_ramp.Blue[i] = val
 
+        TRACE.record(EV_APPLY, monitor_index, dim_percent)
         if monitor_index == -1:
-            for m in self.monitor_dcs:
-                windll.gdi32.SetDeviceGammaRamp(m['hdc'], byref(new_ramp))
+            for i in range(len(self.monitor_dcs)):
+                self._apply(i, dim_percent)
         else:
             if 0 <= monitor_index < len(self.monitor_dcs):
-                hdc = self.monitor_dcs[monitor_index]['hdc']
-                windll.gdi32.SetDeviceGammaRamp(hdc, byref(new_ramp))
+                self._apply(monitor_index, dim_percent)
 
     def restore_all(self):
         for m in self.monitor_dcs:
@@ -164,6 +808,9 @@ class GammaController:
                 
             if monitor_index >= len(self.monitor_dcs):
                 return False
+
+            # Compare against what the driver actually accepted
+            expected_dim_percent = min(expected_dim_percent, self.monitor_dcs[monitor_index]['max_dim'])
                 
             hdc = self.monitor_dcs[monitor_index]['hdc']
             current_ramp = RAMP()
@@ -176,18 +823,409 @@ class GammaController:
             actual_mid_val = current_ramp.Green[128]
             
             if abs(actual_mid_val - expected_mid_val) > 2000: 
+                TRACE.record(EV_RESET, monitor_index, expected_dim_percent)
                 return True
             return False
         except Exception as e:
+            TRACE.error(SITE_GAMMA_RESET)
+            return False
+
+# --- DDC/CI Backlight (Hardware Mode) ---
+BACKEND_GAMMA = "gamma"
+BACKEND_DDC = "ddc"
+BACKEND_HYBRID = "hybrid"
+
+VCP_BRIGHTNESS = 0x10
+DDC_MIN_INTERVAL_S = 0.05
+DDC_MAX_INTERVAL_S = 0.5
+DDC_INTERVAL_DECAY = 0.75 # after each accepted command the backed-off gap shrinks toward the configured one
+DDC_MAX_RETRIES = 3
+HYBRID_SPLIT = 50 # dim % handled by the backlight before gamma takes over
+
+def get_hmonitors_by_device():
+    found = {}
+
+    def callback(hmon, hdc, rect, data):
+        info = MONITORINFOEXW()
+        info.cbSize = ctypes.sizeof(MONITORINFOEXW)
+        if windll.user32.GetMonitorInfoW(ctypes.c_void_p(hmon), byref(info)):
+            found[info.szDevice] = hmon
+        return True
+
+    MONITORENUMPROC = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p,
+                                         ctypes.POINTER(RECT), ctypes.c_void_p)
+    windll.user32.EnumDisplayMonitors(None, None, MONITORENUMPROC(callback), 0)
+    return found
+
+class DDCBus:
+    # dxva2 Monitor Configuration API; every call goes over the I2C link and is slow
+    def __init__(self):
+        self.physical = []
+
+    def open(self, device_name):
+        try:
+            hmon = get_hmonitors_by_device().get(device_name)
+            if not hmon:
+                return None
+            count = ctypes.c_ulong()
+            if not windll.dxva2.GetNumberOfPhysicalMonitorsFromHMONITOR(ctypes.c_void_p(hmon), byref(count)) or not count.value:
+                return None
+            monitors = (PHYSICAL_MONITOR * count.value)()
+            if not windll.dxva2.GetPhysicalMonitorsFromHMONITOR(ctypes.c_void_p(hmon), count.value, monitors):
+                return None
+            self.physical.append((count.value, monitors))
+            return monitors[0].hPhysicalMonitor
+        except Exception as e:
+            return None
+
+    def get_vcp(self, handle, code):
+        current = ctypes.c_ulong()
+        maximum = ctypes.c_ulong()
+        if windll.dxva2.GetVCPFeatureAndVCPFeatureReply(ctypes.c_void_p(handle), ctypes.c_ubyte(code), None,
+                                                          byref(current), byref(maximum)):
+            return current.value, maximum.value
+        return None
+
+    def set_vcp(self, handle, code, value):
+        return bool(windll.dxva2.SetVCPFeature(ctypes.c_void_p(handle), ctypes.c_ubyte(code), ctypes.c_ulong(value)))
+
+    def close_all(self):
+        for count, monitors in self.physical:
+            try: windll.dxva2.DestroyPhysicalMonitors(count, monitors)
+            except: pass
+        self.physical.clear()
+
+class SimulatedDDCBus:
+    # Stand-in for development without DDC/CI hardware (NOX_DDC_SIM=1). Each call
+    # takes as long as a real one and calls that arrive too fast are rejected.
+    def __init__(self, write_delay=0.04, read_delay=0.04, min_interval=DDC_MIN_INTERVAL_S, maximum=100):
+        self.write_delay = write_delay
+        self.read_delay = read_delay
+        self.min_interval = min_interval
+        self.maximum = maximum
+        self.monitors = {}
+        self.writes = 0
+        self.reads = 0
+        self.rejected = 0
+        self.min_gap = None
+
+    def open(self, device_name):
+        self.monitors[device_name] = {'value': self.maximum, 'last': 0.0}
+        return device_name
+
+    def _busy(self, mon):
+        gap = time.monotonic() - mon['last']
+        if gap < self.min_interval:
+            self.rejected += 1
+            return True
+        if mon['last'] and (self.min_gap is None or gap < self.min_gap):
+            self.min_gap = gap
+        return False
+
+    def get_vcp(self, handle, code):
+        mon = self.monitors[handle]
+        if self._busy(mon):
+            return None
+        time.sleep(self.read_delay)
+        mon['last'] = time.monotonic()
+        self.reads += 1
+        return mon['value'], self.maximum
+
+    def set_vcp(self, handle, code, value):
+        mon = self.monitors[handle]
+        if self._busy(mon):
             return False
+        time.sleep(self.write_delay)
+        mon['last'] = time.monotonic()
+        mon['value'] = value
+        self.writes += 1
+        return True
+
+    def close_all(self):
+        pass
+
+class DDCMonitorQueue:
+    # One worker per monitor. submit() only stores the latest wanted level, so the
+    # UI never waits on the bus and a burst of slider moves becomes one write.
+    def __init__(self, bus, handle, min_interval=DDC_MIN_INTERVAL_S):
+        self.bus = bus
+        self.handle = handle
+        self.base_interval = min_interval
+        self.min_interval = min_interval
+        self.pending = None
+        self.busy = False
+        self.closed = False
+        self.last_cmd = 0.0
+        self.current = None
+        self.maximum = None
+        self.original = None
+        self.cv = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, percent):
+        with self.cv:
+            self.pending = percent
+            self.cv.notify()
+
+    def flush(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self.cv:
+            while (self.pending is not None or self.busy) and time.monotonic() < deadline:
+                self.cv.wait(deadline - time.monotonic())
+
+    def close(self):
+        with self.cv:
+            self.closed = True
+            self.cv.notify()
+
+    def _wait_gap(self):
+        gap = self.last_cmd + self.min_interval - time.monotonic()
+        if gap > 0:
+            time.sleep(gap)
+
+    def _accepted(self):
+        self.min_interval = max(self.base_interval, self.min_interval * DDC_INTERVAL_DECAY)
+
+    def _read_caps(self):
+        for _ in range(DDC_MAX_RETRIES):
+            self._wait_gap()
+            reply = self.bus.get_vcp(self.handle, VCP_BRIGHTNESS)
+            self.last_cmd = time.monotonic()
+            if reply and reply[1]:
+                self.current, self.maximum = reply
+                if self.original is None:
+                    self.original = reply[0]
+                self._accepted()
+                return True
+            self.min_interval = min(self.min_interval * 2, DDC_MAX_INTERVAL_S)
+        return False
+
+    def _run(self):
+        retries = 0
+        while True:
+            with self.cv:
+                while self.pending is None and not self.closed:
+                    self.busy = False
+                    self.cv.notify_all()
+                    self.cv.wait()
+                if self.closed:
+                    self.busy = False
+                    self.cv.notify_all()
+                    return
+                percent = self.pending
+                self.pending = None
+                self.busy = True
+
+            if self.maximum is None and not self._read_caps():
+                continue
+
+            target = int(round(self.maximum * percent / 100.0))
+            if target == self.current:
+                continue
+
+            self._wait_gap()
+            ok = self.bus.set_vcp(self.handle, VCP_BRIGHTNESS, target)
+            self.last_cmd = time.monotonic()
+            if ok:
+                self.current = target
+                self._accepted()
+                retries = 0
+                continue
+
+            # Rejected: the monitor wants more time between commands
+            self.min_interval = min(self.min_interval * 2, DDC_MAX_INTERVAL_S)
+            retries += 1
+            if retries <= DDC_MAX_RETRIES:
+                with self.cv:
+                    if self.pending is None:
+                        self.pending = percent
+            else:
+                retries = 0
+
+class DDCController:
+    def __init__(self, device_names, bus=None, min_interval=DDC_MIN_INTERVAL_S):
+        self.bus = bus or DDCBus()
+        self.queues = []
+        for name in device_names:
+            handle = self.bus.open(name)
+            self.queues.append(DDCMonitorQueue(self.bus, handle, min_interval) if handle else None)
+        atexit.register(self.restore_all)
+
+    def supports(self, monitor_index):
+        return 0 <= monitor_index < len(self.queues) and self.queues[monitor_index] is not None
+
+    def set_brightness(self, monitor_index, percent):
+        if self.supports(monitor_index):
+            self.queues[monitor_index].submit(percent)
+
+    def get_brightness(self, monitor_index):
+        # Served from the cached VCP reply, never from the bus
+        if not self.supports(monitor_index):
+            return None
+        q = self.queues[monitor_index]
+        if q.current is None or not q.maximum:
+            return None
+        return q.current * 100.0 / q.maximum
+
+    def restore_all(self, timeout=1.0):
+        for q in self.queues:
+            if q and q.original is not None and q.maximum:
+                q.submit(q.original * 100.0 / q.maximum)
+        for q in self.queues:
+            if q:
+                q.flush(timeout)
+                q.close()
+        self.queues = []
+        self.bus.close_all()
+
+class DisplayController:
+    # Routes a dim level to the backlight, the gamma ramp or both (hybrid: backlight
+    # first, gamma only below the hardware floor). Same interface as GammaController.
+    def __init__(self, gamma, ddc=None, backend=BACKEND_GAMMA, split=HYBRID_SPLIT):
+        self.gamma = gamma
+        self.ddc = ddc
+        self.backend = backend if ddc else BACKEND_GAMMA
+        self.split = split
+        self.gamma_levels = {}
+
+    @property
+    def monitor_dcs(self):
+        return self.gamma.monitor_dcs
+
+    def split_level(self, monitor_index, dim_percent):
+        # -> (backlight brightness % or None, gamma dim %)
+        if self.backend == BACKEND_GAMMA or not self.ddc.supports(monitor_index):
+            return None, dim_percent
+        if self.backend == BACKEND_DDC:
+            return 100 - dim_percent, 0
+        if dim_percent <= self.split:
+            return 100 - dim_percent * 100.0 / self.split, 0
+        return 0, (dim_percent - self.split) * 100.0 / (100 - self.split)
+
+    def set_dim_level(self, monitor_index, dim_percent):
+        if dim_percent < 0: dim_percent = 0
+        if dim_percent > 100: dim_percent = 100
+        if self.backend == BACKEND_GAMMA:
+            self.gamma.set_dim_level(monitor_index, dim_percent)
+            return
+
+        indices = range(len(self.monitor_dcs)) if monitor_index == -1 else [monitor_index]
+        for i in indices:
+            brightness, gamma_dim = self.split_level(i, dim_percent)
+            if brightness is not None:
+                self.ddc.set_brightness(i, brightness)
+            # In ddc mode the ramp stays at identity; don't resend it on every level change
+            if self.gamma_levels.get(i) != int(gamma_dim):
+                self.gamma_levels[i] = int(gamma_dim)
+                self.gamma.set_dim_level(i, int(gamma_dim))
+
+    def is_gamma_reset(self, monitor_index, expected_dim_percent):
+        reset = self.gamma.is_gamma_reset(monitor_index, int(self.split_level(monitor_index, expected_dim_percent)[1]))
+        if reset:
+            self.gamma_levels.pop(monitor_index, None)
+        return reset
+
+    def get_backlight(self, monitor_index):
+        # Last brightness the monitor confirmed, or None when the backlight isn't used
+        if self.backend == BACKEND_GAMMA or not self.ddc.supports(monitor_index):
+            return None
+        return self.ddc.get_brightness(monitor_index)
+
+    def get_max_dim(self, monitor_index):
+        gamma_max = self.gamma.get_max_dim(monitor_index)
+        if self.backend == BACKEND_GAMMA or not self.ddc.supports(monitor_index):
+            return gamma_max
+        if self.backend == BACKEND_DDC:
+            return 100
+        return int(self.split + gamma_max * (100 - self.split) / 100.0)
+
+    def restore_all(self):
+        if self.ddc:
+            self.ddc.restore_all()
+        self.gamma.restore_all()
+
+def create_display_controller(gamma):
+    config = read_config_data()
+    backend = config.get("backend", BACKEND_GAMMA)
+    if backend not in (BACKEND_DDC, BACKEND_HYBRID):
+        return DisplayController(gamma)
+
+    bus = SimulatedDDCBus() if os.getenv('NOX_DDC_SIM') else DDCBus()
+    min_interval = config_number(config, "ddc_min_interval_ms", DDC_MIN_INTERVAL_S * 1000, 1, DDC_MAX_INTERVAL_S * 1000) / 1000.0
+    with PROFILER.phase("ddc.open"):
+        ddc = DDCController([m['name'] for m in gamma.monitor_dcs], bus, min_interval)
+    return DisplayController(gamma, ddc, backend, config_number(config, "hybrid_split", HYBRID_SPLIT, 1, 99))
+
+def run_ddc_selftest():
+    # `--ddc-selftest`: drives DDCMonitorQueue against SimulatedDDCBus, no hardware needed
+    failures = []
+
+    bus = SimulatedDDCBus(write_delay=0.01, read_delay=0.01, min_interval=DDC_MIN_INTERVAL_S)
+    q = DDCMonitorQueue(bus, bus.open("SIM1"))
+    for i in range(100):
+        q.submit(i)
+    q.flush(5.0)
+    if bus.monitors["SIM1"]['value'] != 99:
+        failures.append(f"final value {bus.monitors['SIM1']['value']}, expected 99")
+    if bus.writes > 3:
+        failures.append(f"{bus.writes} writes for a burst of 100, expected at most 3")
+    if bus.rejected:
+        failures.append(f"{bus.rejected} commands rejected at the configured gap")
+    if bus.min_gap is not None and bus.min_gap < DDC_MIN_INTERVAL_S:
+        failures.append(f"commands {bus.min_gap * 1000:.1f} ms apart, minimum is {DDC_MIN_INTERVAL_S * 1000:.0f} ms")
+    q.close()
+
+    # A monitor that was slow for a while must get its normal rate back
+    bus = SimulatedDDCBus(write_delay=0.005, read_delay=0.005, min_interval=DDC_MIN_INTERVAL_S * 4)
+    q = DDCMonitorQueue(bus, bus.open("SIM2"))
+    q.submit(10)
+    q.flush(5.0)
+    backed_off = q.min_interval
+    bus.min_interval = DDC_MIN_INTERVAL_S
+    for i in range(20):
+        q.submit(20 + i)
+        q.flush(5.0)
+    if backed_off <= DDC_MIN_INTERVAL_S:
+        failures.append("rejections did not back off the command gap")
+    if q.min_interval != DDC_MIN_INTERVAL_S:
+        failures.append(f"gap stuck at {q.min_interval * 1000:.0f} ms after the monitor recovered")
+    q.close()
+
+    for f in failures:
+        print(f"FAIL {f}")
+    print("DDC self-test " + ("failed" if failures else "passed"))
+    return not failures
 
 # --- Hyper Overlay (Hyper Mode) ---
+OVERLAY_FRAME_MS = 16
+LWA_ALPHA = 0x2
+
+def dim_to_alpha(dim_percent):
+    return (dim_percent / 100.0) * 0.98
+
+class LayeredWindowBackend:
+    # Sets overlay alpha straight through SetLayeredWindowAttributes, one pass per
+    # frame, instead of a Tk attributes('-alpha') round-trip per window.
+    def apply(self, batch):
+        failed = []
+        for hwnd, alpha in batch:
+            try:
+                ok = windll.user32.SetLayeredWindowAttributes(hwnd, 0, int(round(alpha * 255)), LWA_ALPHA)
+            except Exception as e:
+                ok = False
+            if not ok:
+                failed.append(hwnd)
+        return failed
+
 class HyperOverlay:
-    def __init__(self, root):
+    def __init__(self, root, backend=None):
         self.root = root
+        self.backend = backend or LayeredWindowBackend()
         self.windows = []
         self.active = False
-        self.current_alpha = 0.0
+        self.levels = {}
+        self.default_level = 0
+        self.flush_pending = False
 
     def get_monitor_work_area(self, x, y):
         pt = POINT(x, y)
@@ -203,10 +1241,14 @@ class HyperOverlay:
         windll.user32.SystemParametersInfoW(48, 0, byref(rect), 0)
         return (rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
 
-    def update(self, active, dim_percent):
+    def target_alpha(self, name):
+        return dim_to_alpha(self.levels.get(name, self.default_level))
+
+    def update(self, active, levels, default=0):
+        # levels: {device name: dim %}; monitors not in it use default
         self.active = active
-        alpha = (dim_percent / 100.0) * 0.98 
-        self.current_alpha = alpha
+        self.levels = dict(levels)
+        self.default_level = default
 
         if not active:
             self.destroy_overlays()
@@ -214,15 +1256,37 @@ class HyperOverlay:
 
         if not self.windows:
             self.create_overlays()
-        
-        for win in self.windows:
-            win.attributes('-alpha', alpha)
+            return
+
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.root.after(OVERLAY_FRAME_MS, self.flush)
+
+    def flush(self):
+        self.flush_pending = False
+        if not self.active:
+            return
+
+        batch = []
+        for w in self.windows:
+            alpha = self.target_alpha(w['name'])
+            if abs(alpha - w['alpha']) >= 1 / 255.0:
+                w['alpha'] = alpha
+                batch.append((w['hwnd'], alpha))
+        if not batch:
+            return
+
+        failed = set(self.backend.apply(batch))
+        for w in self.windows:
+            if w['hwnd'] in failed:
+                w['win'].attributes('-alpha', w['alpha'])
 
     def create_overlays(self):
         monitors = get_monitors()
 
         for i, m in enumerate(monitors):
             work_x, work_y, work_w, work_h = self.get_monitor_work_area(m.x + 10, m.y + 10)
+            alpha = self.target_alpha(m.name)
 
             top = tk.Toplevel(self.root)
             top.title("NoxOverlay")
@@ -234,8 +1298,9 @@ class HyperOverlay:
             top.geometry(f"{work_w}x{work_h}+{work_x}+{work_y}")
             
             top.attributes('-topmost', True)
-            top.attributes('-alpha', self.current_alpha)
+            top.attributes('-alpha', alpha)
 
+            hwnd = None
             try:
                 hwnd = windll.user32.GetParent(top.winfo_id())
                 if hwnd == 0: hwnd = top.winfo_id()
@@ -245,16 +1310,16 @@ class HyperOverlay:
             except Exception as e:
                 print(f"Overlay Error: {e}")
 
-            self.windows.append(top)
+            self.windows.append({'win': top, 'hwnd': hwnd, 'name': m.name, 'alpha': alpha})
 
     def destroy_overlays(self):
-        for win in self.windows:
-            try: win.destroy()
+        for w in self.windows:
+            try: w['win'].destroy()
             except: pass
         self.windows.clear()
 
 # --- Custom Slider Widget ---
-class ModernSlider(tk.Canvas):
+class ModernSlider(tk.Canvas if tk else object):
     def __init__(self, master, from_=0, to=100, command=None, 
                  track_active_col="#000000", track_rem_col="#60cdff", 
                  thumb_fill_col="#2d2d2d", thumb_border_col="#60cdff", 
@@ -279,7 +1344,16 @@ class ModernSlider(tk.Canvas):
         self.bind("<Button-1>", self.on_click)
         self.bind("<B1-Motion>", self.on_drag)
 
+    _thumb_cache = {}
+
     def _create_smooth_thumb(self):
+        # Thumbs are shared between sliders with the same colours
+        key = (self.col_thumb_fill, self.col_thumb_border, self.thumb_radius)
+        if key not in ModernSlider._thumb_cache:
+            ModernSlider._thumb_cache[key] = self._render_thumb()
+        return ModernSlider._thumb_cache[key]
+
+    def _render_thumb(self):
         scale = 4
         r = self.thumb_radius
         size = r * 2 * scale
@@ -340,16 +1414,275 @@ class ModernSlider(tk.Canvas):
         self.set(val)
         if self.command: self.command(val)
 
+# --- Tray Icons ---
+TRAY_ICON_SIZE = 64
+TRAY_LEVEL_BUCKETS = 11
+TRAY_PRESETS = (0, 20, 40, 60, 80)
+LR_DEFAULTSIZE = 0x40
+NIM_MODIFY = 1
+NIF_ICON = 2
+
+def tray_bucket(level):
+    level = max(0, min(100, level))
+    return int(round(level * (TRAY_LEVEL_BUCKETS - 1) / 100.0))
+
+def render_default_tray_icon():
+    img = Image.new('RGB', (64, 64), (32, 32, 32)) 
+    d = ImageDraw.Draw(img)
+    d.ellipse([16, 16, 48, 48], fill="#60cdff") 
+    return img
+
+def create_tray_hicon(img):
+    # Windows takes PNG data as icon resource bits, so no .ico file is written
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    data = buf.getvalue()
+    return windll.user32.CreateIconFromResourceEx(data, len(data), True, 0x00030000, 0, 0, LR_DEFAULTSIZE)
+
+class TrayIconSet:
+    # Every level/mode icon is drawn once (or read back from a single cached sheet)
+    # and turned into an HICON once, so swapping icons during a held hotkey is a
+    # dict lookup plus one Shell_NotifyIcon call.
+    def __init__(self, accent, hyper):
+        self.accent = accent
+        self.hyper = hyper
+        self.icons = {}
+        self.handles = {}
+        self.base_path = "nox_icon.png" if os.path.exists("nox_icon.png") else None
+
+    def cache_path(self):
+        stamp = 0
+        if self.base_path:
+            try:
+                stamp = int(os.path.getmtime(self.base_path))
+            except:
+                pass
+        name = f"tray-{CURRENT_VERSION}-{self.accent.strip('#')}-{self.hyper.strip('#')}-{stamp}.png"
+        return os.path.join(get_config_dir(), name)
+
+    def get(self, level, hyper):
+        return self.icons.get((bool(hyper), tray_bucket(level)))
+
+    def get_handle(self, level, hyper):
+        return self.handles.get((bool(hyper), tray_bucket(level)))
+
+    def release(self):
+        handles, self.handles = self.handles, {}
+        for handle in handles.values():
+            if handle:
+                windll.user32.DestroyIcon(handle)
+
+    def load(self):
+        path = self.cache_path()
+        sheet = None
+        try:
+            if os.path.exists(path):
+                sheet = Image.open(path)
+                sheet.load()
+                if sheet.size != (TRAY_ICON_SIZE * TRAY_LEVEL_BUCKETS, TRAY_ICON_SIZE * 2):
+                    sheet = None
+        except:
+            sheet = None
+
+        if sheet is None:
+            sheet = self.render_sheet()
+            try:
+                sheet.save(path)
+            except Exception as e:
+                pass
+
+        icons = {}
+        for row, hyper in enumerate((False, True)):
+            for bucket in range(TRAY_LEVEL_BUCKETS):
+                x, y = bucket * TRAY_ICON_SIZE, row * TRAY_ICON_SIZE
+                icons[(hyper, bucket)] = sheet.crop((x, y, x + TRAY_ICON_SIZE, y + TRAY_ICON_SIZE))
+
+        # All or nothing: without a full set the tray falls back to pystray's own conversion
+        try:
+            self.handles = {key: create_tray_hicon(icon) for key, icon in icons.items()}
+        except Exception as e:
+            self.handles = {}
+        if not all(self.handles.values()):
+            self.release()
+        self.icons = icons
+
+    def render_sheet(self):
+        base = None
+        try:
+            if self.base_path:
+                base = Image.open(self.base_path).convert("RGBA")
+        except:
+            base = None
+
+        sheet = Image.new("RGBA", (TRAY_ICON_SIZE * TRAY_LEVEL_BUCKETS, TRAY_ICON_SIZE * 2), (0, 0, 0, 0))
+        for row, color in enumerate((self.accent, self.hyper)):
+            for bucket in range(TRAY_LEVEL_BUCKETS):
+                icon = self.render_icon(bucket, color, base)
+                sheet.paste(icon, (bucket * TRAY_ICON_SIZE, row * TRAY_ICON_SIZE))
+        return sheet
+
+    def render_icon(self, bucket, color, base):
+        scale = 4
+        size = TRAY_ICON_SIZE * scale
+        ring = 7 * scale
+        img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        draw.ellipse((0, 0, size - 1, size - 1), fill="#202020")
+        draw.ellipse((ring // 2, ring // 2, size - ring // 2, size - ring // 2), outline="#404040", width=ring)
+        if bucket:
+            extent = 360 * bucket / (TRAY_LEVEL_BUCKETS - 1)
+            draw.arc((ring // 2, ring // 2, size - ring // 2, size - ring // 2), -90, -90 + extent, fill=color, width=ring)
+
+        inner = size - 4 * ring
+        if base is not None:
+            img.alpha_composite(base.resize((inner, inner), Image.LANCZOS), (2 * ring, 2 * ring))
+        else:
+            pad = size // 4 + ring // 2
+            draw.ellipse((pad, pad, size - pad, size - pad), fill=color)
+        return img.resize((TRAY_ICON_SIZE, TRAY_ICON_SIZE), Image.LANCZOS)
+
+# --- State Store ---
+CONFIG_SAVE_DELAY_MS = 1000
+
+class StateStore:
+    # The one copy of the dim state: master level, per-monitor levels, Hyper Mode
+    # and the active profile. update() merges into a pending change, then every
+    # subscriber gets a diff with only the fields that really changed, plus a version.
+    # Updates made while subscribers run are merged into the next diff, never dropped.
+    # Event loop thread only; other threads go through UiDispatcher.
+    def __init__(self, master, monitor_count, hyper=False):
+        self.master = master
+        self.levels = [master] * monitor_count
+        self.hyper = hyper
+        self.profile = None
+        self.version = 0
+        self.subscribers = []
+        self.pending = {}
+        self.pending_levels = {}
+        self.publishing = False
+        self.merged = 0
+
+    def subscribe(self, func):
+        self.subscribers.append(func)
+
+    def update(self, master=None, levels=None, hyper=None, profile=None):
+        if master is not None: self.pending['master'] = master
+        if hyper is not None: self.pending['hyper'] = bool(hyper)
+        if profile is not None: self.pending['profile'] = profile
+        if levels: self.pending_levels.update(levels)
+        if self.publishing:
+            self.merged += 1
+            return
+        self.publishing = True
+        try:
+            diff = self._take_diff()
+            while diff:
+                for func in self.subscribers:
+                    try:
+                        func(diff)
+                    except Exception as e:
+                        TRACE.error(SITE_STATE)
+                diff = self._take_diff()
+        finally:
+            self.publishing = False
+
+    def update_all(self, value, hyper=None, profile=None):
+        self.update(master=value, levels=dict.fromkeys(range(len(self.levels)), value),
+                    hyper=hyper, profile=profile)
+
+    def _take_diff(self):
+        pending, self.pending = self.pending, {}
+        pending_levels, self.pending_levels = self.pending_levels, {}
+
+        diff = {}
+        if 'master' in pending and pending['master'] != self.master:
+            self.master = diff['master'] = pending['master']
+        if 'hyper' in pending and pending['hyper'] != self.hyper:
+            self.hyper = diff['hyper'] = pending['hyper']
+        levels = {}
+        for idx, value in pending_levels.items():
+            if 0 <= idx < len(self.levels) and self.levels[idx] != value:
+                self.levels[idx] = levels[idx] = value
+        if levels:
+            diff['levels'] = levels
+        # A profile stays active until something else changes the state
+        profile = pending.get('profile', None if diff else self.profile)
+        if profile != self.profile:
+            self.profile = diff['profile'] = profile
+
+        if not diff:
+            return None
+        self.version += 1
+        diff['version'] = self.version
+        return diff
+
 # --- UI Application ---
+# Startup target: saved ramps applied within this long of process start
+TIME_TO_DIMMED_TARGET_MS = 150
+IDLE_STAGE_DELAY_MS = 1000
+
+def elapsed_since_start_ms():
+    return (time.perf_counter() - _PROCESS_T0) * 1000
+
+MAX_VISIBLE_ROWS = 4
+
+def load_monitor_groups(monitor_count):
+    # config.json "groups": {"Left wall": [1, 2, 3]}, numbered like the "Display N" labels
+    groups = {}
+    config_groups = read_config_data().get("groups", {})
+    if not isinstance(config_groups, dict):
+        return groups
+    for name, members in config_groups.items():
+        if not isinstance(members, list):
+            continue
+        try:
+            indices = [int(n) - 1 for n in members if 1 <= int(n) <= monitor_count]
+        except (TypeError, ValueError):
+            continue
+        if indices:
+            groups[str(name)] = indices
+    return groups
+
+def run_critical_stage():
+    # Config, DCs and the saved ramps, before any GUI module or window is loaded
+    with PROFILER.phase("load_config"):
+        level = load_config()
+    gamma = GammaController()
+    display = create_display_controller(gamma)
+    with PROFILER.phase("apply_saved_ramps"):
+        display.set_dim_level(-1, int(level))
+    return display, level, elapsed_since_start_ms()
+
 class DimmerApp:
-    def __init__(self, root):
+    supports_hyper = True
+
+    def __init__(self, root, display, initial_dim, time_to_dimmed_ms=None, overlay=None, headless=False):
+        # display already shows initial_dim (run_critical_stage, or a replay's FakeDisplay)
         self.root = root
-        self.gamma = GammaController()
-        self.overlay = HyperOverlay(root)
-        
+        # Replays run headless: no tray, hotkeys, network or config writes
+        self.headless = headless
+        self.executor = BackgroundExecutor()
+        self.dispatch = UiDispatcher(root)
+        self.on_master_slide = PROFILER.wrap(self.on_master_slide, "on_master_slide")
+        self.on_indiv_slide = PROFILER.wrap(self.on_indiv_slide, "on_indiv_slide")
+        self.enforce_gamma = PROFILER.wrap(self.enforce_gamma, "enforce_gamma")
+
         self.MAX_DIM = 100
-        self.DEFAULT_DIM = self.load_config() 
-        self.is_updating = False
+        self.DEFAULT_DIM = initial_dim
+        self.gamma = self.display = display
+        self.time_to_dimmed_ms = time_to_dimmed_ms
+        RECORDER.start(len(self.gamma.monitor_dcs), self.DEFAULT_DIM)
+        if not self.headless:
+            STATUS.open()
+
+        self.state = StateStore(self.DEFAULT_DIM, len(self.gamma.monitor_dcs))
+        self.applied_levels = [int(self.DEFAULT_DIM)] * len(self.gamma.monitor_dcs)
+        self.config_save_pending = False
+        self.overlay = overlay or HyperOverlay(root)
+        self.tray_icons = None
+        self.tray_key = None
+        self.tray_menu_stale = False
+        self.tray_hooked = False
         
         self.colors = {
             "bg": "#202020",
@@ -361,23 +1694,43 @@ class DimmerApp:
             "disabled": "#404040",
         }
         
+        # UI stage: window, widgets and tray
         self.setup_fonts()
-        self.setup_window()
-        self.setup_styles()
-        self.setup_tray()
-        self.setup_ui()
+        with PROFILER.phase("setup_window"):
+            self.setup_window()
+            self.setup_styles()
+        if not self.headless:
+            with PROFILER.phase("setup_tray"):
+                self.setup_tray()
+        with PROFILER.phase("setup_ui"):
+            self.setup_ui()
+
+        # Subscribers run in this order, so the driver gets the new level first
+        self.state.subscribe(self.apply_state_to_display)
+        self.state.subscribe(self.apply_state_to_overlay)
+        self.state.subscribe(self.apply_state_to_widgets)
+        self.state.subscribe(self.publish_status)
+        self.state.subscribe(self.schedule_config_save)
         
-        self.root.after(200, self.apply_default_dimming)
+        self.apply_default_dimming()
         self.root.after(2000, self.enforce_gamma)
-
-        threading.Thread(target=self.fetch_monitor_names_bg, daemon=True).start()
-        
-        self.check_for_updates()
+        if self.headless:
+            return
         self.setup_global_hotkeys()
 
         self.root.bind("<FocusOut>", self.on_focus_out)
         self.root.bind('<Control-q>', lambda e: self.quit_app())
 
+        # Idle stage: name resolution and the update check wait until the app has settled
+        self.root.after(IDLE_STAGE_DELAY_MS, lambda: self.root.after_idle(self.run_idle_stage))
+
+    def run_idle_stage(self):
+        PROFILER.mark("idle_stage")
+        self.executor.submit(self.fetch_monitor_names_bg)
+        self.check_for_updates()
+        if PROFILER.enabled:
+            self.root.after(10000, lambda: PROFILER.write_report("startup", time_to_dimmed_ms=self.time_to_dimmed_ms))
+
     def setup_fonts(self):
         self.font_main = ("Montserrat", 10)
         self.font_header = ("Montserrat", 14, "bold")
@@ -436,18 +1789,25 @@ class DimmerApp:
         self.container.pack(fill='both', expand=True, padx=15, pady=5)
 
         mon_count = len(self.gamma.monitor_dcs)
+        self.monitor_groups = load_monitor_groups(mon_count)
+        self.filtered = list(range(mon_count))
+        self.list_offset = 0
         self.monitor_controls = [] 
+        self.group_slider = None
         
         self.create_master_control(enabled=(mon_count > 1))
+        if mon_count > MAX_VISIBLE_ROWS:
+            self.create_group_control()
         ttk.Separator(self.container, orient='horizontal').pack(fill='x', pady=15)
         self.create_monitor_list()
         self.create_footer()
         
-        req_height = 170 + (mon_count * 65) + 120
-        if req_height > 600: req_height = 600
+        req_height = 170 + (len(self.monitor_controls) * 65) + 120
+        if self.group_slider: req_height += 40
 
         rect = RECT()
         windll.user32.SystemParametersInfoW(48, 0, byref(rect), 0)
+        if req_height > rect.bottom - rect.top: req_height = rect.bottom - rect.top
         width = 360
         x_pos = rect.right - width
         y_pos = rect.bottom - req_height
@@ -474,7 +1834,7 @@ class DimmerApp:
 
         if enabled:
             self.master_slider = ModernSlider(frame, from_=0, to=self.MAX_DIM, 
-                                              bg=self.colors["bg"], command=self.on_master_slide)
+                                              bg=self.colors["bg"], command=self.on_master_input)
             self.master_slider.pack(fill='x')
         else:
             dummy = ModernSlider(frame, bg=self.colors["bg"],
@@ -489,41 +1849,179 @@ class DimmerApp:
             self.master_slider = dummy
 
     def fetch_monitor_names_bg(self):
-        real_names = get_real_monitor_names()
+        with PROFILER.phase("monitor_names.powershell"):
+            real_names = get_real_monitor_names()
         if real_names:
-            self.root.after(0, lambda: self.update_monitor_labels(real_names))
+            self.dispatch.post(self.update_monitor_labels, real_names)
 
     def update_monitor_labels(self, real_names):
         for i, name in enumerate(real_names):
-            if i < len(self.monitor_controls) and i < len(self.gamma.monitor_dcs):
+            if i < len(self.gamma.monitor_dcs):
                 self.gamma.monitor_dcs[i]['friendly_name'] = name
-                new_text = f"Display {i+1} • {name}"
-                self.monitor_controls[i]['name_lbl'].config(text=new_text)
+        for row in self.monitor_controls:
+            row['index'] = None
+        self.apply_filter()
+
+    def monitor_title(self, idx):
+        return f"Display {idx+1} • {self.gamma.monitor_dcs[idx]['friendly_name']}"
+
+    def create_group_control(self):
+        frame = ttk.Frame(self.container, style="Win.TFrame")
+        frame.pack(fill='x', pady=(12, 0))
+
+        search = ttk.Frame(frame, style="Win.TFrame")
+        search.pack(fill='x')
+        ttk.Label(search, text="Filter", style="Dim.TLabel").pack(side='left', padx=(0, 8))
+
+        self.filter_var = tk.StringVar()
+        tk.Entry(search, textvariable=self.filter_var, bg=self.colors["surface"], fg=self.colors["text"],
+                 insertbackground="white", bd=0, font=self.font_small).pack(side='left', fill='x', expand=True, ipady=2)
+        self.filter_var.trace_add('write', lambda *a: self.apply_filter())
+
+        # Shown only while a filter or group name is active
+        self.group_frame = ttk.Frame(frame, style="Win.TFrame")
+        header = ttk.Frame(self.group_frame, style="Win.TFrame")
+        header.pack(fill='x', pady=(8, 5))
+        self.lbl_group_name = ttk.Label(header, text="", style="Sub.TLabel")
+        self.lbl_group_name.pack(side='left')
+        self.lbl_group_val = ttk.Label(header, text="0%", style="Dim.TLabel")
+        self.lbl_group_val.pack(side='right')
+
+        self.group_slider = ModernSlider(self.group_frame, from_=0, to=self.MAX_DIM,
+                                         bg=self.colors["bg"], command=self.on_group_input)
+        self.group_slider.pack(fill='x')
 
     def create_monitor_list(self):
-        for i, mon in enumerate(self.gamma.monitor_dcs):
-            frame = ttk.Frame(self.container, style="Win.TFrame")
-            frame.pack(fill='x', pady=8)
+        # Only MAX_VISIBLE_ROWS rows are built; scrolling rebinds them to other monitors
+        self.list_frame = ttk.Frame(self.container, style="Win.TFrame")
+        self.list_frame.pack(fill='both', expand=True)
+        self.list_frame.columnconfigure(0, weight=1)
+
+        for k in range(min(len(self.state.levels), MAX_VISIBLE_ROWS)):
+            frame = ttk.Frame(self.list_frame, style="Win.TFrame")
+            frame.grid(row=k, column=0, sticky='ew', pady=8)
             
             header = ttk.Frame(frame, style="Win.TFrame")
             header.pack(fill='x', pady=(0, 5))
             
-            full_name = f"Display {i+1} • {mon['friendly_name']}"
-            
-            name_lbl = ttk.Label(header, text=full_name, style="Sub.TLabel")
+            name_lbl = ttk.Label(header, text="", style="Sub.TLabel")
             name_lbl.pack(side='left')
             
             lbl_val = ttk.Label(header, text="0%", style="Dim.TLabel", cursor="xterm")
             lbl_val.pack(side='right')
             
-            lbl_val.bind("<Double-Button-1>", lambda e, idx=i, lbl=lbl_val: self.start_edit(e, idx, lbl))
+            row = {'frame': frame, 'label': lbl_val, 'index': None, 'name_lbl': name_lbl}
+            lbl_val.bind("<Double-Button-1>", lambda e, r=row: self.start_edit(e, r['index'], r['label']) if r['index'] is not None else None)
             
-            slider = ModernSlider(frame, from_=0, to=self.MAX_DIM, 
-                                  bg=self.colors["bg"], 
-                                  command=lambda v, idx=i, l=lbl_val: self.on_indiv_slide(v, idx, l))
-            slider.pack(fill='x')
+            row['slider'] = ModernSlider(frame, from_=0, to=self.MAX_DIM, 
+                                         bg=self.colors["bg"], 
+                                         command=lambda v, r=row: self.on_indiv_input(v, r['index']) if r['index'] is not None else None)
+            row['slider'].pack(fill='x')
             
-            self.monitor_controls.append({'slider': slider, 'label': lbl_val, 'index': i, 'name_lbl': name_lbl})
+            self.monitor_controls.append(row)
+
+        self.list_scroll = None
+        if len(self.state.levels) > MAX_VISIBLE_ROWS:
+            self.list_scroll = tk.Scrollbar(self.list_frame, orient='vertical', command=self.on_list_scroll,
+                                            width=8, bd=0, bg=self.colors["surface"], troughcolor=self.colors["bg"])
+            self.root.bind("<MouseWheel>", self.on_list_wheel)
+        self.render_monitor_rows()
+
+    def render_monitor_rows(self):
+        visible = len(self.monitor_controls)
+        self.list_offset = min(max(self.list_offset, 0), max(0, len(self.filtered) - visible))
+
+        for k, row in enumerate(self.monitor_controls):
+            pos = self.list_offset + k
+            if pos < len(self.filtered):
+                idx = self.filtered[pos]
+                if row['index'] != idx:
+                    row['index'] = idx
+                    row['name_lbl'].config(text=self.monitor_title(idx))
+                self.refresh_row(row)
+                row['frame'].grid()
+            else:
+                row['index'] = None
+                row['frame'].grid_remove()
+
+        if self.list_scroll:
+            total = len(self.filtered)
+            if total > visible:
+                self.list_scroll.set(self.list_offset / total, (self.list_offset + visible) / total)
+                self.list_scroll.grid(row=0, column=1, rowspan=visible, sticky='ns', padx=(6, 0))
+            else:
+                self.list_scroll.grid_remove()
+
+    def refresh_row(self, row):
+        value = self.state.levels[row['index']]
+        row['slider'].set(value)
+        row['text'] = self.format_level(row['index'], value)
+        row['label'].config(text=row['text'])
+
+    def format_level(self, idx, value):
+        # Shows the driver's real limit when the slider asks for more than it accepts,
+        # and the backlight the monitor last confirmed over DDC/CI
+        text = f"{int(value)}%"
+        limit = self.display.get_max_dim(idx)
+        if value > limit:
+            text += f" (max {limit}%)"
+        backlight = self.display.get_backlight(idx)
+        if backlight is not None:
+            text += f" · backlight {int(round(backlight))}%"
+        return text
+
+    def refresh_backlight_labels(self):
+        # DDC writes land asynchronously; only labels whose text changed are touched
+        for row in self.monitor_controls:
+            if row['index'] is None:
+                continue
+            text = self.format_level(row['index'], self.state.levels[row['index']])
+            if text != row.get('text'):
+                row['text'] = text
+                row['label'].config(text=text)
+
+    def refresh_monitor_row(self, idx):
+        for row in self.monitor_controls:
+            if row['index'] == idx:
+                self.refresh_row(row)
+                break
+
+    def on_list_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.list_offset = int(round(float(amount) * len(self.filtered)))
+        elif action == 'scroll':
+            step = len(self.monitor_controls) if unit == 'pages' else 1
+            self.list_offset += int(amount) * step
+        self.render_monitor_rows()
+
+    def on_list_wheel(self, event):
+        self.list_offset += -1 if event.delta > 0 else 1
+        self.render_monitor_rows()
+
+    def apply_filter(self):
+        text = self.filter_var.get().strip().lower() if self.group_slider else ""
+        everything = list(range(len(self.state.levels)))
+        group_name = next((name for name in self.monitor_groups if name.lower() == text), None)
+
+        if not text:
+            self.filtered = everything
+        elif group_name:
+            self.filtered = self.monitor_groups[group_name]
+        else:
+            self.filtered = [i for i in everything if text in self.monitor_title(i).lower()]
+        self.list_offset = 0
+        self.render_monitor_rows()
+
+        if not self.group_slider:
+            return
+        if text and self.filtered:
+            value = self.state.levels[self.filtered[0]]
+            self.lbl_group_name.config(text=f"{group_name or 'Matching'} ({len(self.filtered)} displays)")
+            self.lbl_group_val.config(text=f"{int(value)}%")
+            self.group_slider.set(value)
+            self.group_frame.pack(fill='x')
+        else:
+            self.group_frame.pack_forget()
 
     def create_footer(self):
         frame = ttk.Frame(self.root, style="Win.TFrame")
@@ -536,7 +2034,7 @@ class DimmerApp:
         self.chk_hyper = tk.Checkbutton(hyper_frame, text="Hyper Mode (Taskbar Visible)", variable=self.hyper_var,
                            bg=self.colors["bg"], fg=self.colors["hyper"], 
                            selectcolor=self.colors["bg"], activebackground=self.colors["bg"],
-                           activeforeground=self.colors["hyper"], command=self.toggle_hyper_mode,
+                           activeforeground=self.colors["hyper"], command=self.on_hyper_input,
                            font=("Montserrat", 9, "bold"))
         
         self.chk_hyper.pack(side='left', anchor='w', pady=0)
@@ -572,36 +2070,45 @@ class DimmerApp:
         link.bind("<Leave>", lambda e: link.config(fg=self.colors["text_dim"]))
 
     def check_for_updates(self, silent=True):
+        if silent:
+            cached = get_cached_release(get_update_url())
+            if cached:
+                self._show_release(cached[0], cached[1], silent)
+                return
+
         if not silent:
             self.btn_update.config(text="Checking...", fg=self.colors["text_dim"])
         self.btn_update.config(command=lambda: None)
-        threading.Thread(target=self._check_update_bg, args=(silent,), daemon=True).start()
+        self.executor.submit(self._check_update_bg, silent)
 
     def _check_update_bg(self, silent):
+        with PROFILER.phase("update_check"):
+            self._check_update(silent)
+
+    def _check_update(self, silent):
         try:
-            url = "https://api.github.com/repos/YashvardhanG/Nox-Dimmer/releases/latest"
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                latest_version = data.get("tag_name", "")
-                self.latest_release_url = data.get("html_url", "https://github.com/YashvardhanG/Nox-Dimmer/releases/latest")
-
-                current_version = "v1.4"
-                
-                if latest_version == current_version:
-                    if silent:
-                        self.root.after(0, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
-                    else:
-                        self.root.after(0, lambda: self._update_btn_state("Up to date", "#4caf50", None))
-                        self.root.after(2500, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
-                else:
-                    self.root.after(0, lambda: self._update_btn_state("Update App", self.colors["accent"], self.latest_release_url))
+            latest_version, release_url = fetch_latest_release(get_update_url())
+            self.dispatch.post(self._show_release, latest_version, release_url, silent)
         except Exception as e:
-            if not silent:
-                self.root.after(0, lambda: self._update_btn_state("Failed", "#ff4d4d", None))
-                self.root.after(2000, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
+            self.dispatch.post(self._show_update_failure, silent)
+
+    def _show_update_failure(self, silent):
+        if not silent:
+            self._update_btn_state("Failed", "#ff4d4d", None)
+            self.root.after(2000, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
+        else:
+            self._update_btn_state("Check Updates", self.colors["text_dim"], None)
+
+    def _show_release(self, latest_version, release_url, silent):
+        self.latest_release_url = release_url
+        if latest_version == CURRENT_VERSION:
+            if silent:
+                self._update_btn_state("Check Updates", self.colors["text_dim"], None)
             else:
-                self.root.after(0, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
+                self._update_btn_state("Up to date", "#4caf50", None)
+                self.root.after(2500, lambda: self._update_btn_state("Check Updates", self.colors["text_dim"], None))
+        else:
+            self._update_btn_state("Update App", self.colors["accent"], self.latest_release_url)
 
     def _update_btn_state(self, text, color, url=None):
         self.btn_update.config(text=text, fg=color)
@@ -611,21 +2118,30 @@ class DimmerApp:
             self.btn_update.config(command=lambda: self.check_for_updates(silent=False))
 
     def adjust_dim_level(self, delta):
-        new_val = self.master_slider.value + delta
+        self.set_master_level(self.state.master + delta)
+
+    def set_master_level(self, new_val):
         if new_val < 0: new_val = 0
         if new_val > self.MAX_DIM: new_val = self.MAX_DIM
-        self.master_slider.set(new_val)
-        self.on_master_slide(new_val)
-        self.save_config()
+        self.state.update_all(new_val)
+
+    def set_hyper_mode(self, enabled):
+        self.state.update(hyper=enabled)
+
+    def apply_profile(self, profile, name=None):
+        # One update, so subscribers see the level and mode change together
+        if "dim_level" in profile:
+            level = max(0, min(self.MAX_DIM, profile["dim_level"]))
+            self.state.update_all(level, hyper=profile.get("hyper"), profile=name)
+        else:
+            self.state.update(hyper=profile.get("hyper"), profile=name)
 
     def toggle_hyper_mode_from_tcp(self):
-        current = self.hyper_var.get()
-        self.hyper_var.set(not current)
-        self.toggle_hyper_mode()
+        self.state.update(hyper=not self.state.hyper)
 
-    def toggle_hyper_mode(self):
-        is_hyper = self.hyper_var.get()
-        current_val = self.master_slider.value
+    def show_hyper_mode(self, is_hyper):
+        if self.hyper_var.get() != is_hyper:
+            self.hyper_var.set(is_hyper)
         
         active_color = self.colors["hyper"] if is_hyper else self.colors["accent"]
         
@@ -634,19 +2150,16 @@ class DimmerApp:
         
         for ctrl in self.monitor_controls:
             ctrl['slider'].set_accent_color(active_color)
+        if self.group_slider:
+            self.group_slider.set_accent_color(active_color)
 
         if is_hyper:
-            self.overlay.update(True, current_val)
             self.title_lbl.config(fg=self.colors["hyper"])
         else:
-            self.overlay.update(False, 0)
             self.title_lbl.config(fg=self.colors["text"])
-        
-        self.gamma.set_dim_level(-1, int(current_val))
-        self.root.lift()
 
     def start_edit(self, event, idx, label_widget):
-        initial_val = label_widget.cget("text").replace("%", "")
+        initial_val = label_widget.cget("text").split("%")[0]
         entry = tk.Entry(label_widget.master, width=4, bg=self.colors["surface"], 
                          fg=self.colors["text"], insertbackground="white", bd=0, 
                          justify='right', font=self.font_main)
@@ -674,63 +2187,121 @@ class DimmerApp:
         
         if val is not None:
             if idx == -1: 
-                self.master_slider.set(val)
-                self.on_master_slide(val)
+                self.on_master_input(val)
             else: 
-                for ctrl in self.monitor_controls:
-                    if ctrl['index'] == idx:
-                        ctrl['slider'].set(val)
-                        self.on_indiv_slide(val, idx, label_widget)
-                        break
+                self.on_indiv_input(val, idx)
 
     def apply_default_dimming(self):
-        self.master_slider.set(self.DEFAULT_DIM)
-        self.on_master_slide(self.DEFAULT_DIM)
+        # The ramps were already applied in the critical stage; only sync the widgets
+        value = self.state.master
+        self.master_slider.set(value)
+        self.lbl_master_val.config(text=f"{int(value)}%")
+        self.render_monitor_rows()
+        self.publish_status()
+
+    # State subscribers: each only does the work for the fields in the diff
+    def apply_state_to_display(self, diff):
+        changed = {idx: int(value) for idx, value in diff.get('levels', {}).items()
+                   if int(value) != self.applied_levels[idx]}
+        if not changed:
+            return
+        for idx, value in changed.items():
+            self.applied_levels[idx] = value
+        values = set(changed.values())
+        if len(changed) == len(self.applied_levels) and len(values) == 1:
+            self.display.set_dim_level(-1, values.pop())
+        else:
+            for idx, value in changed.items():
+                self.display.set_dim_level(idx, value)
 
-    def on_master_slide(self, val):
-        if self.is_updating: return
-        self.is_updating = True
-        
-        try:
-            value = float(val)
-            if value > self.MAX_DIM: value = self.MAX_DIM
-            
-            self.lbl_master_val.config(text=f"{int(value)}%", foreground=self.colors["text_dim"])
+    def apply_state_to_overlay(self, diff):
+        if 'hyper' in diff:
+            if self.state.hyper:
+                self.overlay.update(True, self.overlay_levels(), self.state.master)
+            else:
+                self.overlay.update(False, {})
+            self.root.lift()
+        elif self.state.hyper and ('levels' in diff or 'master' in diff):
+            self.overlay.update(True, self.overlay_levels(), self.state.master)
+
+    def apply_state_to_widgets(self, diff):
+        if 'master' in diff:
+            value = diff['master']
+            if self.master_slider.value != value:
+                self.master_slider.set(value)
+            self.lbl_master_val.config(text=f"{int(value)}%")
+        levels = diff.get('levels')
+        if levels:
+            if len(levels) == 1:
+                self.refresh_monitor_row(next(iter(levels)))
+            else:
+                self.render_monitor_rows()
+        if 'hyper' in diff:
+            self.show_hyper_mode(diff['hyper'])
+        if 'master' in diff or 'hyper' in diff:
+            self.update_tray_icon()
+
+    def publish_status(self, diff=None):
+        STATUS.publish(self.state.levels, self.state.hyper, self.state.master)
+
+    def schedule_config_save(self, diff):
+        # Held hotkeys and slider drags end up as one write
+        if 'master' in diff and not self.config_save_pending:
+            self.config_save_pending = True
+            self.root.after(CONFIG_SAVE_DELAY_MS, self.flush_config)
+
+    def flush_config(self):
+        self.config_save_pending = False
+        self.save_config()
 
-            self.gamma.set_dim_level(-1, int(value))
+    def on_master_input(self, val):
+        RECORDER.record(REC_MASTER, -1, val)
+        self.on_master_slide(val)
 
-            if self.hyper_var.get():
-                self.overlay.update(True, value)
-            else:
-                self.overlay.update(False, 0)
+    def on_indiv_input(self, val, idx):
+        RECORDER.record(REC_INDIV, idx, val)
+        self.on_indiv_slide(val, idx)
 
-            for ctrl in self.monitor_controls:
-                ctrl['slider'].set(value)
-                ctrl['label'].config(text=f"{int(value)}%")
-                
-        finally:
-            self.is_updating = False
+    def on_group_input(self, val):
+        # Recorded per display, since the filter that picked them is not part of the recording
+        for idx in self.filtered:
+            RECORDER.record(REC_INDIV, idx, val)
+        self.on_group_slide(val)
 
-    def on_indiv_slide(self, val, idx, lbl_widget):
-        if self.is_updating: return
-        self.is_updating = True
-        
-        try:
-            value = float(val)
-            if value > self.MAX_DIM: value = self.MAX_DIM
-            
-            lbl_widget.config(text=f"{int(value)}%", foreground=self.colors["text_dim"])
-            
-            self.gamma.set_dim_level(idx, int(value))
+    def on_preset_input(self, level):
+        RECORDER.record(REC_MASTER, -1, level)
+        self.set_master_level(level)
 
-            if self.hyper_var.get():
-                 self.overlay.update(True, value)
-            
-            if len(self.monitor_controls) == 1:
-                self.master_slider.set(value) 
-                self.lbl_master_val.config(text=f"{int(value)}%")
-        finally:
-            self.is_updating = False
+    def on_hyper_input(self, enabled=None):
+        # The checkbox has already flipped hyper_var; the tray toggle passes the new mode
+        if enabled is None:
+            enabled = self.hyper_var.get()
+        RECORDER.record(REC_HYPER, 0, int(bool(enabled)))
+        self.set_hyper_mode(enabled)
+
+    def on_master_slide(self, val):
+        value = float(val)
+        if value > self.MAX_DIM: value = self.MAX_DIM
+        self.state.update_all(value)
+
+    def overlay_levels(self):
+        return {m['name']: self.state.levels[i] for i, m in enumerate(self.gamma.monitor_dcs)
+                if i < len(self.state.levels)}
+
+    def on_indiv_slide(self, val, idx):
+        value = float(val)
+        if value > self.MAX_DIM: value = self.MAX_DIM
+        # With one display the disabled master slider mirrors it
+        if len(self.state.levels) == 1:
+            self.state.update(master=value, levels={idx: value})
+        else:
+            self.state.update(levels={idx: value})
+
+    def on_group_slide(self, val):
+        value = float(val)
+        if value > self.MAX_DIM: value = self.MAX_DIM
+        self.lbl_group_val.config(text=f"{int(value)}%")
+        self.state.update(levels=dict.fromkeys(self.filtered, value))
 
     def check_registry(self):
         try:
@@ -741,25 +2312,14 @@ class DimmerApp:
         except: return False
 
     def get_config_path(self):
-        config_dir = os.path.join(os.getenv('APPDATA'), 'NoxDimmer')
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-        return os.path.join(config_dir, 'config.json')
+        return get_config_path()
 
     def load_config(self):
-        try:
-            with open(self.get_config_path(), 'r') as f:
-                data = json.load(f)
-                return data.get("dim_level", 30)
-        except:
-            return 30
+        return load_config()
 
     def save_config(self):
-        try:
-            with open(self.get_config_path(), 'w') as f:
-                json.dump({"dim_level": self.master_slider.value}, f)
-        except Exception as e:
-            pass
+        if not self.headless:
+            save_config(self.state.master)
 
     # def toggle_autostart(self):
     #     path = sys.executable 
@@ -771,13 +2331,10 @@ class DimmerApp:
     #     except: pass
 
     def enforce_gamma(self):
-        if not self.is_updating:
-
-            for ctrl in self.monitor_controls:
-                idx = ctrl['index']
-                expected_val = int(ctrl['slider'].value)
-                if self.gamma.is_gamma_reset(idx, expected_val):
-                    self.gamma.set_dim_level(idx, expected_val)
+        for idx, level in enumerate(self.applied_levels):
+            if self.display.is_gamma_reset(idx, level):
+                self.display.set_dim_level(idx, level)
+        self.refresh_backlight_labels()
         
         self.root.after(1000, self.enforce_gamma)
 
@@ -820,88 +2377,37 @@ class DimmerApp:
         self.root.lift()
         self.root.focus_force()
         self.fade_in()
-        self.root.after(200, lambda: self.gamma.set_dim_level(-1, int(self.master_slider.value)))
+        self.root.after(200, self.reapply_levels)
+
+    def reapply_levels(self):
+        for idx, level in enumerate(self.applied_levels):
+            self.display.set_dim_level(idx, level)
 
     def start_move(self, e): self.x, self.y = e.x, e.y
     def do_move(self, e): self.root.geometry(f"+{self.root.winfo_x()+(e.x-self.x)}+{self.root.winfo_y()+(e.y-self.y)}")
 
     def setup_global_hotkeys(self):
         self.running = True
-        threading.Thread(target=self._hotkey_listener_bg, daemon=True).start()
+        self.executor.start_service("hotkeys", self._hotkey_listener_bg)
 
     def _hotkey_listener_bg(self):
-        VK_RSHIFT = 0xA1
-        VK_CONTROL = 0x11
-        VK_MENU = 0x12
-        VK_OEM_4 = 0xDB # [
-        VK_OEM_6 = 0xDD # ]
-        VK_OEM_5 = 0xDC # \
-
-        def is_pressed(vk):
-            return (windll.user32.GetAsyncKeyState(vk) & 0x8000) != 0
-
-        prev_lb = False
-        prev_rb = False
-        prev_bs = False
-        
-        lb_ticks = 0
-        rb_ticks = 0
-
-        while getattr(self, 'running', True):
-            try:
-                rshift = is_pressed(VK_RSHIFT)
-                ctrl = is_pressed(VK_CONTROL)
-                alt = is_pressed(VK_MENU)
-                
-                lb = is_pressed(VK_OEM_4)
-                rb = is_pressed(VK_OEM_6)
-                bs = is_pressed(VK_OEM_5)
-
-                valid_combo = (rshift and not ctrl and not alt) or (ctrl and alt and not rshift)
-
-                if lb and valid_combo:
-                    if not prev_lb:
-                        self.root.after(0, lambda: self.adjust_dim_level(-10))
-                        lb_ticks = 0
-                    else:
-                        lb_ticks += 1
-                        if lb_ticks > 25:
-                            self.root.after(0, lambda: self.adjust_dim_level(-10))
-                            lb_ticks = 22
-                else:
-                    lb_ticks = 0
-
-                if rb and valid_combo:
-                    if not prev_rb:
-                        self.root.after(0, lambda: self.adjust_dim_level(10))
-                        rb_ticks = 0
-                    else:
-                        rb_ticks += 1
-                        if rb_ticks > 25:
-                            self.root.after(0, lambda: self.adjust_dim_level(10))
-                            rb_ticks = 22
-                else:
-                    rb_ticks = 0
-
-                if bs and valid_combo:
-                    if not prev_bs:
-                        self.root.after(0, self.toggle_hyper_mode_from_tcp)
-
-                prev_lb = lb
-                prev_rb = rb
-                prev_bs = bs
-                
-                time.sleep(0.02)
-            except Exception as e:
-                time.sleep(0.1)
+        hotkey_listener(self)
 
     def quit_app(self):
         self.running = False
+        self.dispatch.close()
+        self.executor.shutdown()
+        PROFILER.write_report("exit", time_to_dimmed_ms=self.time_to_dimmed_ms,
+                              threads=self.executor.thread_count(), dispatch=self.dispatch.stats())
+        RECORDER.close()
+        STATUS.close()
         self.save_config()
-        self.gamma.restore_all()
+        self.display.restore_all()
         self.overlay.destroy_overlays()
         if hasattr(self, 'icon'):
             self.icon.stop()
+        if self.tray_icons is not None:
+            self.tray_icons.release()
 
         self.root.quit()
         self.root.destroy()
@@ -912,25 +2418,743 @@ class DimmerApp:
             if os.path.exists("nox_icon.png"):
                 img = Image.open("nox_icon.png")
             else:
-                img = Image.new('RGB', (64, 64), (32, 32, 32)) 
-                d = ImageDraw.Draw(img)
-                d.ellipse([16, 16, 48, 48], fill="#60cdff") 
+                img = render_default_tray_icon()
         except:
-            img = Image.new('RGB', (64, 64), (32, 32, 32)) 
-            d = ImageDraw.Draw(img)
-            d.ellipse([16, 16, 48, 48], fill="#60cdff") 
-        
+            img = render_default_tray_icon()
+
+        presets = [self.tray_preset_item(level) for level in TRAY_PRESETS]
         menu = pystray.Menu(
-            pystray.MenuItem("Show", lambda i, item: self.root.after(0, self.show_window), default=True),
-            pystray.MenuItem("Quit", lambda i, item: self.root.after(0, self.quit_app))
+            pystray.MenuItem("Show", lambda i, item: self.dispatch.post(self.show_window), default=True),
+            pystray.MenuItem("Dim Level", pystray.Menu(*presets)),
+            pystray.MenuItem("Hyper Mode", lambda i, item: self.dispatch.post(self.on_tray_hyper_input),
+                             checked=lambda item: self.tray_key is not None and self.tray_key[0]),
+            pystray.MenuItem("Quit", lambda i, item: self.dispatch.post(self.quit_app))
         )
         self.icon = pystray.Icon("Nox Dimmer", img, "Nox Dimmer", menu)
-        threading.Thread(target=self.icon.run, daemon=True).start()
+        self.tray_hooked = self.hook_tray_messages()
+        self.executor.start_service("tray", self.icon.run)
+        # The full icon set is drawn off the UI thread; the plain icon shows until it is ready
+        self.tray_icons = TrayIconSet(self.colors["accent"], self.colors["hyper"])
+        self.executor.submit(self._load_tray_icons_bg)
+
+    def on_tray_hyper_input(self):
+        self.on_hyper_input(not self.state.hyper)
+
+    def tray_preset_item(self, level):
+        return pystray.MenuItem(f"{level}%", lambda i, item: self.dispatch.post(self.on_preset_input, level),
+                                checked=lambda item: self.tray_key is not None and self.tray_key[1] == tray_bucket(level),
+                                radio=True)
+
+    def hook_tray_messages(self):
+        # pystray's win32 backend builds the popup menu (and its check marks) in update_menu,
+        # so rebuild it when the mouse reaches the icon rather than on every level change.
+        # Explorer restarts re-add pystray's own icon, so the current one is sent again after.
+        handlers = getattr(self.icon, "_message_handlers", None)
+        on_notify = getattr(self.icon, "_on_notify", None)
+        on_taskbar = getattr(self.icon, "_on_taskbarcreated", None)
+        if not handlers or on_notify is None:
+            return False
+        for msg, handler in list(handlers.items()):
+            if handler == on_notify:
+                handlers[msg] = self._tray_notify_hook(handler)
+            elif on_taskbar is not None and handler == on_taskbar:
+                handlers[msg] = self._tray_taskbar_hook(handler)
+        return True
+
+    def _tray_notify_hook(self, handler):
+        def on_notify(wparam, lparam):
+            if self.tray_menu_stale:
+                self.tray_menu_stale = False
+                self.icon.update_menu()
+            return handler(wparam, lparam)
+        return on_notify
+
+    def _tray_taskbar_hook(self, handler):
+        def on_taskbar_created(wparam, lparam):
+            result = handler(wparam, lparam)
+            self.dispatch.post(self.resend_tray_icon)
+            return result
+        return on_taskbar_created
+
+    def resend_tray_icon(self):
+        self.tray_key = None
+        self.update_tray_icon()
+
+    def _load_tray_icons_bg(self):
+        self.tray_icons.load()
+        self.dispatch.post(self.update_tray_icon)
+
+    def update_tray_icon(self):
+        # Only touches the shell when the displayed bucket changes
+        if self.tray_icons is None or not self.tray_icons.icons:
+            return
+        level = self.state.master
+        key = (self.state.hyper, tray_bucket(level))
+        if key == self.tray_key:
+            return
+        self.tray_key = key
+        handle = self.tray_icons.get_handle(level, key[0])
+        if handle and hasattr(self.icon, "_message"):
+            # Assigning icon.icon would re-encode an .ico and LoadImage it on every step
+            self.icon._message(NIM_MODIFY, NIF_ICON, hIcon=handle)
+        else:
+            self.icon.icon = self.tray_icons.get(level, key[0])
+        if self.tray_hooked:
+            self.tray_menu_stale = True
+        else:
+            self.icon.update_menu()
+
+# --- Headless Daemon ---
+# Budgets for `--daemon`, checked by `--bench-startup` against the GUI mode
+DAEMON_STARTUP_BUDGET_MS = 400
+DAEMON_RSS_BUDGET_MB = 30
+
+class PROCESS_MEMORY_COUNTERS(Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t)
+    ]
+
+def get_process_rss_kb():
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+        handle = windll.kernel32.GetCurrentProcess()
+        if windll.psapi.GetProcessMemoryInfo(handle, byref(counters), counters.cb):
+            return counters.WorkingSetSize // 1024
+    except Exception as e:
+        pass
+    return 0
+
+class DaemonLoop:
+    # Stands in for tk.Tk as the event loop: after(), mainloop(), quit() and destroy()
+    # are thread-safe so background threads can schedule work exactly as with Tk.
+    def __init__(self):
+        self._timers = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._running = False
+
+    def after(self, ms, func, *args):
+        due = time.monotonic() + ms / 1000.0
+        with self._cv:
+            heapq.heappush(self._timers, (due, next(self._seq), func, args))
+            self._cv.notify()
+
+    def mainloop(self):
+        self._running = True
+        while True:
+            with self._cv:
+                if not self._running:
+                    break
+                now = time.monotonic()
+                if not self._timers or self._timers[0][0] > now:
+                    timeout = self._timers[0][0] - now if self._timers else 0.5
+                    self._cv.wait(min(timeout, 0.5))
+                    continue
+                _, _, func, args = heapq.heappop(self._timers)
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Daemon task error: {e}")
+
+    def quit(self):
+        with self._cv:
+            self._running = False
+            self._cv.notify()
+
+    def destroy(self):
+        with self._cv:
+            self._timers.clear()
+
+class NoxDaemon:
+    # Hyper Mode needs overlay windows; IPC answers NOX_ERR for it instead of ACKing a no-op
+    supports_hyper = False
+
+    def __init__(self, root):
+        self.root = root
+        self.enforce_gamma = PROFILER.wrap(self.enforce_gamma, "enforce_gamma")
+        self.executor = BackgroundExecutor(workers=0)
+        self.dispatch = UiDispatcher(root)
+
+        self.MAX_DIM = 100
+        self.display, level, self.time_to_dimmed_ms = run_critical_stage()
+        self.gamma = self.display
+        self.running = True
+        RECORDER.start(len(self.gamma.monitor_dcs), level)
+        self.state = StateStore(level, len(self.gamma.monitor_dcs))
+        self.state.subscribe(self.apply_state)
+        self.config_save_pending = False
+        STATUS.open()
+        self.publish_status()
+
+        self.root.after(2000, self.enforce_gamma)
+        self.executor.start_service("hotkeys", hotkey_listener, self)
+
+    def adjust_dim_level(self, delta):
+        self.set_master_level(self.state.master + delta)
+
+    def set_master_level(self, new_val):
+        if new_val < 0: new_val = 0
+        if new_val > self.MAX_DIM: new_val = self.MAX_DIM
+        self.state.update_all(new_val)
+
+    def apply_state(self, diff):
+        if 'master' not in diff:
+            return
+        self.display.set_dim_level(-1, int(diff['master']))
+        self.publish_status()
+        if not self.config_save_pending:
+            self.config_save_pending = True
+            self.root.after(CONFIG_SAVE_DELAY_MS, self.flush_config)
+
+    def flush_config(self):
+        self.config_save_pending = False
+        save_config(self.state.master)
+
+    def publish_status(self):
+        STATUS.publish(self.state.levels, False, self.state.master)
+
+    def set_hyper_mode(self, enabled):
+        pass
+
+    def apply_profile(self, profile, name=None):
+        if "dim_level" in profile:
+            level = max(0, min(self.MAX_DIM, profile["dim_level"]))
+            self.state.update_all(level, profile=name)
+
+    def toggle_hyper_mode_from_tcp(self):
+        # Hyper Mode needs overlay windows, which the daemon does not have
+        pass
+
+    def show_window(self):
+        pass
+
+    def enforce_gamma(self):
+        expected_val = int(self.state.master)
+        for idx in range(len(self.gamma.monitor_dcs)):
+            if self.display.is_gamma_reset(idx, expected_val):
+                self.display.set_dim_level(idx, expected_val)
+
+        self.root.after(1000, self.enforce_gamma)
+
+    def quit_app(self):
+        self.running = False
+        self.dispatch.close()
+        self.executor.shutdown()
+        PROFILER.write_report("exit", time_to_dimmed_ms=self.time_to_dimmed_ms,
+                              threads=self.executor.thread_count(), dispatch=self.dispatch.stats())
+        RECORDER.close()
+        STATUS.close()
+        save_config(self.state.master)
+        self.display.restore_all()
+
+        self.root.quit()
+        self.root.destroy()
+        sys.exit(0)
+
+def get_launch_command():
+    if getattr(sys, 'frozen', False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(__file__)]
+
+def report_ready(app):
+    print(f"NOX_READY {elapsed_since_start_ms():.1f} {get_process_rss_kb()} {app.time_to_dimmed_ms:.1f}", flush=True)
+    app.quit_app()
+
+def measure_startup(extra_args):
+    start = time.perf_counter()
+    proc = subprocess.Popen(get_launch_command() + extra_args + ["--bench-exit"],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in proc.stdout:
+            if line.startswith("NOX_READY"):
+                wall_ms = (time.perf_counter() - start) * 1000
+                _, _, rss_kb, dimmed_ms = line.split()
+                return wall_ms, int(rss_kb) / 1024.0, float(dimmed_ms)
+    finally:
+        try:
+            proc.wait(timeout=5)
+        except Exception as e:
+            proc.kill()
+    return None, None, None
+
+def run_startup_benchmark(runs=3):
+    results = {}
+    for label, args in (("gui", []), ("daemon", ["--daemon"])):
+        samples = [measure_startup(args) for _ in range(runs)]
+        samples = [smp for smp in samples if smp[0] is not None]
+        if not samples:
+            print(f"{label}: did not report ready")
+            return False
+        samples.sort()
+        results[label] = samples[len(samples) // 2]
+        wall_ms, rss_mb, dimmed_ms = results[label]
+        print(f"{label:>6}: startup {wall_ms:7.1f} ms   rss {rss_mb:6.1f} MB   dimmed after {dimmed_ms:6.1f} ms")
+
+    daemon_ms, daemon_mb, daemon_dimmed = results["daemon"]
+    gui_ms, gui_mb, gui_dimmed = results["gui"]
+    ok = (daemon_ms <= DAEMON_STARTUP_BUDGET_MS and daemon_mb <= DAEMON_RSS_BUDGET_MB
+          and daemon_ms < gui_ms and daemon_mb < gui_mb)
+    print(f"daemon budget: {DAEMON_STARTUP_BUDGET_MS} ms / {DAEMON_RSS_BUDGET_MB} MB -> {'PASS' if ok else 'FAIL'}")
+    dimmed_ok = max(daemon_dimmed, gui_dimmed) <= TIME_TO_DIMMED_TARGET_MS
+    print(f"time-to-dimmed target: {TIME_TO_DIMMED_TARGET_MS} ms -> {'PASS' if dimmed_ok else 'FAIL'}")
+    return ok and dimmed_ok
+
+# --- Record & Replay (--record / --replay) ---
+REC_MAGIC = b"NOXR"
+REC_VERSION = 1
+REC_HEADER = struct.Struct("<4sBBh")  # magic, version, monitor count, initial dim
+REC_EVENT = struct.Struct("<IBbh")    # us since previous event, kind, a, b
+
+REC_MASTER = 1  # a = -1, b = slider value * 100
+REC_INDIV = 2   # a = monitor index, b = slider value * 100
+REC_HOTKEY = 3  # a = HOTKEY_*, b = 1 press / 2 auto-repeat
+REC_IPC = 4     # a = index into IPC_COMMANDS
+REC_HYPER = 5   # a = 0, b = 1 on / 0 off (checkbox and tray)
+REC_KIND_NAMES = {REC_MASTER: "master_slide", REC_INDIV: "indiv_slide", REC_HOTKEY: "hotkey", REC_IPC: "ipc",
+                  REC_HYPER: "hyper_toggle"}
+
+class InputRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.file = None
+        self.last = 0.0
+        self.lock = threading.Lock()
+
+    def start(self, monitor_count, initial_dim):
+        if not self.path or self.file:
+            return
+        try:
+            self.file = open(self.path, 'wb')
+            self.file.write(REC_HEADER.pack(REC_MAGIC, REC_VERSION, monitor_count, int(initial_dim)))
+            self.last = time.perf_counter()
+            self.enabled = True
+        except Exception as e:
+            print(f"Recorder error: {e}")
+
+    def record(self, kind, a, b):
+        if not self.enabled:
+            return
+        if kind in (REC_MASTER, REC_INDIV):
+            b = int(round(float(b) * 100))
+        with self.lock:
+            now = time.perf_counter()
+            delta_us = min(int((now - self.last) * 1e6), 0xFFFFFFFF)
+            self.last = now
+            try:
+                self.file.write(REC_EVENT.pack(delta_us, kind, a, b))
+            except Exception as e:
+                pass
+
+    def close(self):
+        with self.lock:
+            self.enabled = False
+            if self.file:
+                self.file.close()
+                self.file = None
+
+RECORDER = InputRecorder()
+
+def read_recording(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, monitor_count, initial_dim = REC_HEADER.unpack_from(data, 0)
+    if magic != REC_MAGIC or version != REC_VERSION:
+        raise ValueError(f"{path} is not a Nox recording")
+
+    events = []
+    t = 0.0
+    for delta_us, kind, a, b in REC_EVENT.iter_unpack(data[REC_HEADER.size:]):
+        t += delta_us / 1e6
+        events.append((t, kind, a, b))
+    return monitor_count, initial_dim, events
+
+REPLAY_OUTCOMES = ('driver', 'overlay', 'noop')
+
+class FakeDisplay:
+    # Display backend for replays: counts driver calls and times each injected
+    # command until its own first effect: a driver call, an overlay update, or
+    # nothing at all (the state did not change).
+    def __init__(self, monitor_count):
+        self.monitor_dcs = [{'hdc': None, 'orig': None, 'name': f"\\\\.\\REPLAY{i + 1}",
+                             'friendly_name': "Replay Monitor"} for i in range(max(monitor_count, 1))]
+        self.calls = {'set_dim_level': 0, 'is_gamma_reset': 0, 'overlay_update': 0}
+        self.outcomes = {name: [] for name in REPLAY_OUTCOMES}
+        self.command = None
+
+    def run_command(self, injected, func, args):
+        self.command = [injected, None]
+        try:
+            func(*args)
+        finally:
+            injected, outcome = self.command
+            self.command = None
+            if outcome is None:
+                self.outcomes['noop'].append(time.perf_counter() - injected)
+
+    def _complete(self, outcome):
+        # Called on the event loop; effects outside a command (enforcement) are not timed
+        if self.command and self.command[1] is None:
+            self.command[1] = outcome
+            self.outcomes[outcome].append(time.perf_counter() - self.command[0])
+
+    def set_dim_level(self, monitor_index, dim_percent):
+        self.calls['set_dim_level'] += 1
+        self._complete('driver')
+
+    def is_gamma_reset(self, monitor_index, expected_dim_percent):
+        self.calls['is_gamma_reset'] += 1
+        return False
+
+    def get_max_dim(self, monitor_index):
+        return 100
+
+    def get_backlight(self, monitor_index):
+        return None
+
+    def restore_all(self):
+        pass
+
+class FakeOverlay:
+    def __init__(self, display):
+        self.display = display
+        self.active = False
+
+    def update(self, active, levels, default=0):
+        self.active = active
+        self.display.calls['overlay_update'] += 1
+        self.display._complete('overlay')
+
+    def destroy_overlays(self):
+        pass
+
+def inject_recorded_event(app, kind, a, b):
+    if kind == REC_MASTER:
+        app.master_slider.set(b / 100.0)
+        app.on_master_input(b / 100.0)
+    elif kind == REC_INDIV:
+        if 0 <= a < len(app.state.levels):
+            app.on_indiv_input(b / 100.0, a)
+    elif kind == REC_HYPER:
+        app.on_hyper_input(bool(b))
+
+class ReplayDispatcher:
+    # Stands in for app.dispatch during replays so each posted command is timed on its own
+    def __init__(self, inner, display):
+        self.inner = inner
+        self.display = display
+
+    def post(self, func, *args):
+        return self.inner.post(self.display.run_command, time.perf_counter(), func, args)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+def replay_events(app, display, events, speed, done):
+    start = time.perf_counter()
+    for t, kind, a, b in events:
+        if speed:
+            delay = start + t / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        # Each source is delivered the way the live input would arrive
+        if kind in (REC_MASTER, REC_INDIV, REC_HYPER):
+            app.dispatch.post(inject_recorded_event, app, kind, a, b)
+        elif kind == REC_HOTKEY:
+            dispatch_hotkey(app, a, b)
+        elif kind == REC_IPC and 0 <= a < len(IPC_COMMANDS) and IPC_COMMANDS[a] not in (QUIT_WORD, WAKE_WORD, TRACE_WORD, PROFILE_WORD):
+            word = IPC_COMMANDS[a]
+            dispatch_ipc_command(app, word + b" " + str(b).encode() if word in (SET_LEVEL_WORD, SET_HYPER_WORD) else word)
+    done.append(time.perf_counter() - start)
+    app.dispatch.inner.post(app.root.after, 200, app.root.quit)
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+def run_replay(path, speed):
+    monitor_count, initial_dim, events = read_recording(path)
+    display = FakeDisplay(monitor_count)
+
+    load_gui_modules()
+    root = tk.Tk()
+    root.withdraw()
+    app = DimmerApp(root, display, initial_dim, overlay=FakeOverlay(display), headless=True)
+    display.calls['set_dim_level'] = 0
+    display.calls['overlay_update'] = 0
+    app.dispatch = ReplayDispatcher(app.dispatch, display)
+
+    done = []
+    app.executor.start_service("replay", replay_events, app, display, events, speed, done)
+    root.mainloop()
+    root.destroy()
+
+    counts = {}
+    for _, kind, _, _ in events:
+        name = REC_KIND_NAMES.get(kind, str(kind))
+        counts[name] = counts.get(name, 0) + 1
+
+    print(f"replayed {len(events)} events from {os.path.basename(path)} at {'max' if not speed else f'{speed:g}x'} speed "
+          f"in {done[0] if done else 0:.3f} s")
+    for name, count in sorted(counts.items()):
+        print(f"  {name:>13}: {count}")
+    print(f"driver calls: " + ", ".join(f"{k}={v}" for k, v in display.calls.items()))
+    print(f"ui dispatch: " + ", ".join(f"{k}={v}" for k, v in app.dispatch.stats().items()))
+    labels = {'driver': "applied to driver", 'overlay': "overlay only", 'noop': "no-op (unchanged)"}
+    print(f"commands: " + ", ".join(f"{labels[k]}={len(display.outcomes[k])}" for k in REPLAY_OUTCOMES))
+    for outcome in REPLAY_OUTCOMES:
+        lat_ms = [x * 1000 for x in display.outcomes[outcome]]
+        if lat_ms:
+            print(f"  {labels[outcome]:>17} latency (ms): p50 {percentile(lat_ms, 50):.2f}  p95 {percentile(lat_ms, 95):.2f}  "
+                  f"p99 {percentile(lat_ms, 99):.2f}  max {max(lat_ms):.2f}")
+    return True
+
+def get_arg_value(name, default=None):
+    # Values keep their case (paths); flags are matched case-insensitively
+    argv = sys.argv[1:]
+    for i, a in enumerate(argv):
+        if a.lower() == name and i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+# --- Status Page (--status) ---
+# A fixed-layout page in a memory-mapped file that other tools can poll without
+# talking to Nox. seq is odd while a write is in progress (a seqlock): readers
+# retry until they see the same even value before and after copying the page.
+STATUS_MAGIC = b"NOXS"
+STATUS_VERSION = 1
+STATUS_MAX_MONITORS = 32
+STATUS_HEADER = struct.Struct("<4sHHIIBBH")  # magic, version, monitors, seq, pid, flags, master, reserved
+STATUS_SEQ = struct.Struct("<I")
+STATUS_SEQ_OFFSET = 8
+STATUS_SIZE = STATUS_HEADER.size + STATUS_MAX_MONITORS
+STATUS_RUNNING = 1
+STATUS_HYPER = 2
+STATUS_READ_RETRIES = 1000
+
+def get_status_path(port=None):
+    name = f"status-{port}.bin" if port else "status.bin"
+    return os.path.join(get_config_dir(), name)
+
+class StatusPage:
+    # Single writer: only ever published from the event loop thread
+    def __init__(self):
+        self.path = None
+        self.map = None
+        self.seq = 0
+        self.last = None
+        self.writes = 0
+
+    def open(self):
+        if not self.path or self.map is not None:
+            return
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+            try:
+                # Never truncate: a reader may still have the old page mapped
+                if os.fstat(fd).st_size < STATUS_SIZE:
+                    os.lseek(fd, 0, os.SEEK_END)
+                    os.write(fd, b"\0" * (STATUS_SIZE - os.fstat(fd).st_size))
+                self.map = mmap.mmap(fd, STATUS_SIZE)
+            finally:
+                os.close(fd)
+            # Carry on from the previous run's counter so pollers that cache seq see the change
+            self.seq = (STATUS_SEQ.unpack_from(self.map, STATUS_SEQ_OFFSET)[0] + 1) & ~1
+        except Exception as e:
+            self.map = None
+
+    def publish(self, levels, hyper, master, running=True):
+        if self.map is None:
+            return False
+        levels = [max(0, min(100, int(v))) for v in levels[:STATUS_MAX_MONITORS]]
+        flags = (STATUS_RUNNING if running else 0) | (STATUS_HYPER if hyper else 0)
+        master = max(0, min(100, int(master)))
+        state = (flags, master, levels)
+        if state == self.last:
+            return False
+        self.last = state
+
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        STATUS_SEQ.pack_into(self.map, STATUS_SEQ_OFFSET, self.seq)
+        STATUS_HEADER.pack_into(self.map, 0, STATUS_MAGIC, STATUS_VERSION, len(levels), self.seq,
+                                os.getpid(), flags, master, 0)
+        self.map[STATUS_HEADER.size:STATUS_HEADER.size + len(levels)] = bytes(levels)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        STATUS_SEQ.pack_into(self.map, STATUS_SEQ_OFFSET, self.seq)
+        self.writes += 1
+        return True
+
+    def close(self):
+        if self.map is None:
+            return
+        if self.last:
+            flags, master, levels = self.last
+            self.publish(levels, flags & STATUS_HYPER, master, running=False)
+        self.map.close()
+        self.map = None
+
+STATUS = StatusPage()
+
+class StatusReader:
+    def __init__(self, path=None):
+        with open(path or get_status_path(), "rb") as f:
+            self.map = mmap.mmap(f.fileno(), STATUS_SIZE, access=mmap.ACCESS_READ)
+
+    def read(self, retries=STATUS_READ_RETRIES):
+        for _ in range(retries):
+            before = STATUS_SEQ.unpack_from(self.map, STATUS_SEQ_OFFSET)[0]
+            if before & 1:
+                continue
+            page = self.map[:STATUS_SIZE]
+            if STATUS_SEQ.unpack_from(self.map, STATUS_SEQ_OFFSET)[0] != before:
+                continue
+            magic, version, count, seq, pid, flags, master, _ = STATUS_HEADER.unpack_from(page, 0)
+            if magic != STATUS_MAGIC or version != STATUS_VERSION:
+                return None
+            count = min(count, STATUS_MAX_MONITORS)
+            return {
+                'seq': seq,
+                'pid': pid,
+                'running': bool(flags & STATUS_RUNNING),
+                'hyper': bool(flags & STATUS_HYPER),
+                'master': master,
+                'levels': list(page[STATUS_HEADER.size:STATUS_HEADER.size + count])
+            }
+        return None
+
+    def close(self):
+        self.map.close()
+
+def print_status(port=None):
+    try:
+        reader = StatusReader(get_status_path(port))
+    except Exception as e:
+        print("No status page found. Is Nox running?")
+        return False
+    try:
+        status = reader.read()
+    finally:
+        reader.close()
+    if status is None:
+        print("Status page is unreadable.")
+        return False
+    print(json.dumps(status))
+    return status['running']
+
+# --- Global Hotkeys ---
+HOTKEY_DIM_DOWN = 0
+HOTKEY_DIM_UP = 1
+HOTKEY_HYPER = 2
+
+def dispatch_hotkey(app, key, state):
+    RECORDER.record(REC_HOTKEY, key, state)
+    if key == HOTKEY_DIM_DOWN:
+        app.dispatch.post(app.adjust_dim_level, -10)
+    elif key == HOTKEY_DIM_UP:
+        app.dispatch.post(app.adjust_dim_level, 10)
+    elif key == HOTKEY_HYPER:
+        app.dispatch.post(app.toggle_hyper_mode_from_tcp)
+
+def hotkey_listener(app):
+    VK_RSHIFT = 0xA1
+    VK_CONTROL = 0x11
+    VK_MENU = 0x12
+    VK_OEM_4 = 0xDB # [
+    VK_OEM_6 = 0xDD # ]
+    VK_OEM_5 = 0xDC # \
+
+    def is_pressed(vk):
+        return (windll.user32.GetAsyncKeyState(vk) & 0x8000) != 0
+
+    prev_lb = False
+    prev_rb = False
+    prev_bs = False
+    # Only edges of valid combos are traced, never plain typing of the keys
+    traced = {VK_OEM_4: False, VK_OEM_6: False, VK_OEM_5: False}
+
+    lb_ticks = 0
+    rb_ticks = 0
+
+    while getattr(app, 'running', True):
+        try:
+            rshift = is_pressed(VK_RSHIFT)
+            ctrl = is_pressed(VK_CONTROL)
+            alt = is_pressed(VK_MENU)
+
+            lb = is_pressed(VK_OEM_4)
+            rb = is_pressed(VK_OEM_6)
+            bs = is_pressed(VK_OEM_5)
+
+            valid_combo = (rshift and not ctrl and not alt) or (ctrl and alt and not rshift)
+
+            for vk, down in ((VK_OEM_4, lb), (VK_OEM_6, rb), (VK_OEM_5, bs)):
+                active = down and valid_combo
+                if active != traced[vk]:
+                    TRACE.record(EV_HOTKEY, vk, int(active))
+                    traced[vk] = active
+
+            if lb and valid_combo:
+                if not prev_lb:
+                    dispatch_hotkey(app, HOTKEY_DIM_DOWN, 1)
+                    lb_ticks = 0
+                else:
+                    lb_ticks += 1
+                    if lb_ticks > 25:
+                        TRACE.record(EV_HOTKEY, VK_OEM_4, 2)
+                        dispatch_hotkey(app, HOTKEY_DIM_DOWN, 2)
+                        lb_ticks = 22
+            else:
+                lb_ticks = 0
+
+            if rb and valid_combo:
+                if not prev_rb:
+                    dispatch_hotkey(app, HOTKEY_DIM_UP, 1)
+                    rb_ticks = 0
+                else:
+                    rb_ticks += 1
+                    if rb_ticks > 25:
+                        TRACE.record(EV_HOTKEY, VK_OEM_6, 2)
+                        dispatch_hotkey(app, HOTKEY_DIM_UP, 2)
+                        rb_ticks = 22
+            else:
+                rb_ticks = 0
+
+            if bs and valid_combo:
+                if not prev_bs:
+                    dispatch_hotkey(app, HOTKEY_HYPER, 1)
+
+            prev_lb = lb
+            prev_rb = rb
+            prev_bs = bs
+
+            time.sleep(0.02)
+        except Exception as e:
+            TRACE.error(SITE_HOTKEY)
+            time.sleep(0.1)
 
 WAKE_PORTS = [50291, 50292, 50293, 50294, 50295]
 
 QUIT_WORD = b"NOX_DIMMER_QUIT"
 WAKE_WORD = b"NOX_DIMMER_WAKE"
+TRACE_WORD = b"NOX_TRACE"
+SET_LEVEL_WORD = b"NOX_SET_LEVEL"   # NOX_SET_LEVEL <0-100>
+SET_HYPER_WORD = b"NOX_SET_HYPER"   # NOX_SET_HYPER <0|1>
+PROFILE_WORD = b"NOX_PROFILE"       # NOX_PROFILE <name from config "profiles"> or NOX_PROFILE {json}
+
+IPC_COMMANDS = [b"NOX_DIM_UP", b"NOX_DIM_DOWN", b"NOX_HYPER_TOGGLE", QUIT_WORD, WAKE_WORD, TRACE_WORD,
+                SET_LEVEL_WORD, SET_HYPER_WORD, PROFILE_WORD]
 
 def send_command_to_instance(command):
     for port in WAKE_PORTS:
@@ -949,14 +3173,113 @@ def send_command_to_instance(command):
             pass
     return False
 
-def listen_for_wake(app):
+def resolve_profile(arg):
+    if arg.startswith("{"):
+        profile = json.loads(arg)
+    else:
+        profile = read_config_data().get("profiles", {}).get(arg)
+    if not isinstance(profile, dict):
+        return None
+    if "dim_level" in profile:
+        level = profile["dim_level"]
+        if isinstance(level, bool) or not isinstance(level, (int, float)) or not 0 <= level <= 100:
+            return None
+    if "hyper" in profile and not isinstance(profile["hyper"], bool):
+        return None
+    return profile
+
+def dispatch_ipc_command(app, data):
+    # Returns False for commands that are unknown or malformed, before anything is traced
+    word, _, arg = data.strip().partition(b" ")
+    value = 0
+    if word == SET_LEVEL_WORD:
+        if not arg.isdigit() or int(arg) > 100:
+            return False
+        value = int(arg)
+        action = (app.set_master_level, value)
+    elif word == SET_HYPER_WORD:
+        if arg not in (b"0", b"1") or not app.supports_hyper:
+            return False
+        value = int(arg)
+        action = (app.set_hyper_mode, value == 1)
+    elif word == PROFILE_WORD:
+        try:
+            name = arg.decode('utf-8')
+            profile = resolve_profile(name)
+        except Exception as e:
+            profile = None
+        if profile is None or (profile.get("hyper") and not app.supports_hyper):
+            return False
+        action = (app.apply_profile, profile, None if name.startswith("{") else name)
+    elif arg:
+        return False
+    elif word == b"NOX_DIM_UP":
+        action = (app.adjust_dim_level, 10)
+    elif word == b"NOX_DIM_DOWN":
+        action = (app.adjust_dim_level, -10)
+    elif word == b"NOX_HYPER_TOGGLE":
+        if not app.supports_hyper:
+            return False
+        action = (app.toggle_hyper_mode_from_tcp,)
+    elif word == QUIT_WORD:
+        action = (app.quit_app,)
+    elif word == WAKE_WORD:
+        action = (app.show_window,)
+    elif word == TRACE_WORD:
+        action = None
+    else:
+        return False
+
+    TRACE.record(EV_IPC, IPC_COMMANDS.index(word), value)
+    if word == PROFILE_WORD:
+        # The profile's contents live in this machine's config, so record what it does
+        profile = action[1]
+        if "dim_level" in profile:
+            RECORDER.record(REC_MASTER, -1, min(profile["dim_level"], app.MAX_DIM))
+        if "hyper" in profile:
+            RECORDER.record(REC_HYPER, 0, int(profile["hyper"]))
+    else:
+        RECORDER.record(REC_IPC, IPC_COMMANDS.index(word), value)
+    if action:
+        app.dispatch.post(*action)
+    else:
+        TRACE.dump()
+    return True
+
+def get_ipc_settings():
+    # Remote control is opt-in: "ipc_bind": "0.0.0.0" also needs "ipc_token".
+    # Any other address would stop loopback clients (WAKE, --quit, --trace) from reaching us.
+    config = read_config_data()
+    bind = config.get("ipc_bind", "127.0.0.1")
+    token = config.get("ipc_token") or None
+    if bind not in ("127.0.0.1", "localhost", "0.0.0.0"):
+        print("ipc_bind ignored: use \"0.0.0.0\" to accept remote commands")
+        bind = "127.0.0.1"
+    elif bind == "0.0.0.0" and not token:
+        print("ipc_bind ignored: a non-loopback bind requires ipc_token")
+        bind = "127.0.0.1"
+    return bind, token
+
+def authorize_ipc(data, addr, token):
+    # Remote clients send "<token>\n<command>"; local clients may omit the token
+    head, sep, rest = data.partition(b"\n")
+    if sep and token and hmac.compare_digest(head, token.encode('utf-8')):
+        return rest
+    if addr[0] == "127.0.0.1" and not sep:
+        return data
+    if not token and not sep:
+        return data
+    return None
+
+def listen_for_wake(app, port=None):
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    bind, token = get_ipc_settings()
     bound_port = None
     
-    for port in WAKE_PORTS:
+    for candidate in ([port] if port else WAKE_PORTS):
         try:
-            s.bind(('127.0.0.1', port))
-            bound_port = port
+            s.bind((bind, candidate))
+            bound_port = candidate
             break
         except Exception as e:
             continue
@@ -965,51 +3288,174 @@ def listen_for_wake(app):
         return
 
     try:
-        s.listen(1)
+        s.listen(8)
         while True:
             conn, addr = s.accept()
             conn.settimeout(1.0)
             try:
-                data = conn.recv(1024)
-                
+                data = authorize_ipc(conn.recv(1024), addr, token)
+                ok = data is not None and dispatch_ipc_command(app, data)
+
                 try:
-                    conn.sendall(b"NOX_ACK")
+                    conn.sendall(b"NOX_ACK" if ok else b"NOX_ERR")
                 except Exception as e:
-                    pass
-
-                if data == b"NOX_DIM_UP":
-                    app.root.after(0, lambda: app.adjust_dim_level(10))
-                elif data == b"NOX_DIM_DOWN":
-                    app.root.after(0, lambda: app.adjust_dim_level(-10))
-                elif data == b"NOX_HYPER_TOGGLE":
-                    app.root.after(0, app.toggle_hyper_mode_from_tcp)
-                elif data == QUIT_WORD:
-                    app.root.after(0, app.quit_app)
-                elif data == WAKE_WORD:
-                    app.root.after(0, app.show_window)
+                    TRACE.error(SITE_WAKE)
             except Exception as e:
-                pass
+                TRACE.error(SITE_WAKE)
             finally:
                 conn.close()
     except Exception as e:
-        pass
+        TRACE.error(SITE_WAKE)
+
+# --- Fleet (--fleet) ---
+FLEET_CONCURRENCY = 64
+FLEET_TIMEOUT_S = 2.0
+
+def parse_endpoint(text):
+    host, _, port = text.strip().rpartition(":")
+    if not host:
+        return text.strip(), WAKE_PORTS[0]
+    return host, int(port)
+
+def load_endpoints(path):
+    endpoints = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                endpoints.append(parse_endpoint(line))
+    return endpoints
+
+async def _send_one(host, port, payload, timeout, limit):
+    import asyncio
+    async with limit:
+        start = time.perf_counter()
+        status = "error"
+        writer = None
+        try:
+            async def exchange():
+                nonlocal writer
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(payload)
+                await writer.drain()
+                return await reader.read(1024)
+
+            reply = await asyncio.wait_for(exchange(), timeout)
+            status = {b"NOX_ACK": "ok", b"NOX_ERR": "rejected"}.get(reply, "bad_reply")
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except ConnectionRefusedError:
+            status = "refused"
+        except OSError as e:
+            status = "error"
+        finally:
+            if writer:
+                writer.close()
+        return {'host': host, 'port': port, 'status': status,
+                'ms': round((time.perf_counter() - start) * 1000, 1)}
+
+async def _send_all(endpoints, payload, concurrency, timeout):
+    import asyncio
+    limit = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_send_one(h, p, payload, timeout, limit) for h, p in endpoints))
+
+def send_fleet_command(endpoints, command, token=None, concurrency=FLEET_CONCURRENCY, timeout=FLEET_TIMEOUT_S):
+    # asyncio costs ~100 ms to import, so only --fleet pays for it
+    import asyncio
+    payload = (token.encode('utf-8') + b"\n" + command) if token else command
+    return asyncio.run(_send_all(endpoints, payload, concurrency, timeout))
+
+def get_fleet_command():
+    if get_arg_value("--level") is not None:
+        return SET_LEVEL_WORD + b" " + str(int(get_arg_value("--level"))).encode()
+    if get_arg_value("--hyper") is not None:
+        return SET_HYPER_WORD + (b" 1" if get_arg_value("--hyper").lower() in ("1", "on", "true") else b" 0")
+    if get_arg_value("--apply-profile") is not None:
+        return PROFILE_WORD + b" " + get_arg_value("--apply-profile").encode('utf-8')
+    if get_arg_value("--cmd") is not None:
+        return get_arg_value("--cmd").encode('utf-8')
+    return None
+
+def run_fleet():
+    command = get_fleet_command()
+    if not command:
+        print("usage: --fleet <hosts file> (--level N | --hyper on|off | --apply-profile NAME | --cmd RAW)"
+              " [--token T] [--concurrency N] [--timeout S]")
+        return False
+
+    endpoints = load_endpoints(get_arg_value("--fleet"))
+    start = time.perf_counter()
+    results = send_fleet_command(endpoints, command,
+                                 token=get_arg_value("--token") or os.getenv('NOX_IPC_TOKEN'),
+                                 concurrency=int(get_arg_value("--concurrency", FLEET_CONCURRENCY)),
+                                 timeout=float(get_arg_value("--timeout", FLEET_TIMEOUT_S)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    summary = {}
+    for r in results:
+        summary[r['status']] = summary.get(r['status'], 0) + 1
+        if r['status'] != "ok":
+            print(f"  {r['host']}:{r['port']}  {r['status']}  ({r['ms']} ms)")
+    print(f"{command.decode('utf-8', 'replace')} -> {len(results)} instances in {elapsed_ms:.0f} ms: "
+          + ", ".join(f"{k}={v}" for k, v in sorted(summary.items())))
+    return summary.get("ok", 0) == len(results)
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
+    args = [a.lower() for a in sys.argv[1:]]
+    if args:
+        arg = args[0]
         if arg == "--quit":
             if send_command_to_instance(QUIT_WORD):
                 time.sleep(0.1)
             sys.exit()
-            
-    if send_command_to_instance(WAKE_WORD):
+        if arg == "--trace":
+            sys.exit(0 if send_command_to_instance(TRACE_WORD) else 1)
+        if arg == "--replay":
+            speed = get_arg_value("--speed", "1")
+            sys.exit(0 if run_replay(get_arg_value("--replay"), 0 if speed.lower() == "max" else float(speed)) else 1)
+        if arg == "--bench-startup":
+            sys.exit(0 if run_startup_benchmark() else 1)
+        if arg == "--ddc-selftest":
+            sys.exit(0 if run_ddc_selftest() else 1)
+        if arg == "--fleet":
+            sys.exit(0 if run_fleet() else 1)
+        if arg == "--status":
+            port = get_arg_value("--port")
+            sys.exit(0 if print_status(int(port) if port else None) else 1)
+
+    bench_exit = "--bench-exit" in args
+    if "--profile" in args or "--profile=hot" in args:
+        PROFILER.enable(hot="--profile=hot" in args)
+    RECORDER.path = get_arg_value("--record")
+    # An explicit --port runs a separate instance alongside any other (fleet testing)
+    ipc_port = int(get_arg_value("--port")) if get_arg_value("--port") else None
+    STATUS.path = get_status_path(ipc_port)
+
+    if not bench_exit and not ipc_port and send_command_to_instance(WAKE_WORD):
         sys.exit()
-    
-    root = tk.Tk()
-    root.withdraw()
-    app = DimmerApp(root)
-    
-    root.after(100, app.show_window)
-        
-    threading.Thread(target=listen_for_wake, args=(app,), daemon=True).start()
-    root.mainloop()
\ No newline at end of file
+
+    if DAEMON_MODE:
+        root = DaemonLoop()
+        install_crash_dump()
+        app = NoxDaemon(root)
+        if PROFILER.enabled:
+            root.after(10000, lambda: PROFILER.write_report("startup", time_to_dimmed_ms=app.time_to_dimmed_ms))
+    else:
+        install_crash_dump()
+        display, level, dimmed_ms = run_critical_stage()
+        load_gui_modules()
+        with PROFILER.phase("tk_init"):
+            root = tk.Tk()
+            root.withdraw()
+        install_tk_crash_dump(root)
+        with PROFILER.phase("app_init"):
+            app = DimmerApp(root, display, level, dimmed_ms)
+
+        root.after(100, app.show_window)
+
+    if bench_exit:
+        root.after(0, lambda: report_ready(app))
+    else:
+        app.executor.start_service("ipc", listen_for_wake, app, ipc_port)
+    root.after(0, lambda: PROFILER.mark("event_loop_running"))
+    root.mainloop()